@@ -0,0 +1,98 @@
+"""
+Single-statement add-to-cart and quantity updates.
+
+add_to_cart() inserts the cart line, or adds to the quantity of the line
+already there, with one INSERT ... ON CONFLICT DO UPDATE against the
+unique (cart, product) constraint. The stock check is part of the same
+statement: the row is only inserted when the product has `quantity` in
+stock, and the conflict update only applies when the new total still
+fits. Concurrent adds therefore cannot lose an increment or push a line
+past the stock, without any locking in Python. On SQLite the transaction
+around it begins IMMEDIATE (see DATABASES): a concurrent add waits for the
+write lock before running anything, so it can only fail before writing.
+
+The statement is raw SQL, so the CartItem signals do not fire and the
+badge count is refreshed here when a line was inserted: PostgreSQL reports that from the statement
+(xmax = 0 on a freshly inserted row); elsewhere the line is looked up
+first in the same transaction.
+
+set_quantity() overwrites a line's quantity with one conditional UPDATE
+that carries the same stock check.
+"""
+
+from django.db import connections, transaction
+
+from products.models import Product
+from .badge import refresh_cart_counts
+from .models import CartItem
+
+
+class InsufficientStock(Exception):
+    pass
+
+
+def _reports_inserts(connection):
+    return connection.vendor == "postgresql"
+
+
+def _upsert_sql(connection):
+    quote = connection.ops.quote_name
+    items = quote(CartItem._meta.db_table)
+    products = quote(Product._meta.db_table)
+    return (
+        f"INSERT INTO {items} (cart_id, product_id, quantity) "
+        f"SELECT %s, id, %s FROM {products} WHERE id = %s AND stock >= %s "
+        f"ON CONFLICT (cart_id, product_id) DO UPDATE SET quantity = {items}.quantity + excluded.quantity "
+        f"WHERE {items}.quantity + excluded.quantity <= "
+        f"(SELECT stock FROM {products} WHERE id = excluded.product_id) "
+        f"RETURNING id, {'(xmax = 0)' if _reports_inserts(connection) else 'NULL'}"
+    )
+
+
+def add_to_cart(cart, product_id, quantity, using="default"):
+    """
+    Add `quantity` of `product_id` to `cart`; returns the CartItem id.
+
+    Raises Product.DoesNotExist for an unknown product and
+    InsufficientStock when the line would exceed the product's stock.
+    """
+    if quantity < 1:
+        raise ValueError("quantity must be at least 1")
+    connection = connections[using]
+    with transaction.atomic(using=using):
+        existed = None
+        if not _reports_inserts(connection):
+            existed = CartItem.objects.using(using).filter(cart=cart, product_id=product_id).exists()
+        with connection.cursor() as cursor:
+            cursor.execute(_upsert_sql(connection), [cart.pk, quantity, product_id, quantity])
+            row = cursor.fetchone()
+    if row is None:
+        if not Product.objects.using(using).filter(pk=product_id).exists():
+            raise Product.DoesNotExist(f"Product {product_id} does not exist")
+        raise InsufficientStock(f"Insufficient stock for product {product_id}")
+    item_id, inserted = row
+    if inserted or existed is False:
+        # A new line; an increment leaves the badge count unchanged.
+        cart_ids = [cart.pk]
+        transaction.on_commit(lambda: refresh_cart_counts(cart_ids), using=using)
+    return item_id
+
+
+def set_quantity(user, item_id, quantity, using="default"):
+    """
+    Set the quantity of `user`'s cart line `item_id`, removing it below 1.
+
+    Raises CartItem.DoesNotExist for a line that is not in the user's cart
+    and InsufficientStock when the product does not have `quantity` left.
+    """
+    items = CartItem.objects.using(using).filter(pk=item_id, cart__user=user)
+    if quantity < 1:
+        # delete() sends post_delete, which refreshes the badge count.
+        if not items.delete()[0]:
+            raise CartItem.DoesNotExist(f"Cart item {item_id} does not exist")
+        return
+    if items.filter(product__stock__gte=quantity).update(quantity=quantity):
+        return
+    if not items.exists():
+        raise CartItem.DoesNotExist(f"Cart item {item_id} does not exist")
+    raise InsufficientStock(f"Insufficient stock for cart item {item_id}")
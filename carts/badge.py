@@ -0,0 +1,40 @@
+"""
+Cached cart item count for the navbar badge.
+
+The count of a user's cart items is kept in the shared cache under
+CART_COUNT_KEY, so rendering the badge costs no query. carts.signals
+rewrites it after a CartItem is created or deleted and the transaction
+commits; a miss (eviction, first visit) is filled by one COUNT.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Cart, CartItem
+
+CART_COUNT_KEY = "carts:count:{user_id}"
+
+
+def _timeout():
+    return getattr(settings, "CART_COUNT_CACHE_TIMEOUT", 86400)
+
+
+def count_cart_items(user_id):
+    """Recount `user_id`'s cart items and store the result"""
+    count = CartItem.objects.filter(cart__user_id=user_id).count()
+    cache.set(CART_COUNT_KEY.format(user_id=user_id), count, _timeout())
+    return count
+
+
+def cart_item_count(user_id):
+    """Number of items in `user_id`'s cart, from the cache when possible"""
+    count = cache.get(CART_COUNT_KEY.format(user_id=user_id))
+    if count is None:
+        count = count_cart_items(user_id)
+    return count
+
+
+def refresh_cart_counts(cart_ids):
+    """Recount the owners of `cart_ids`; carts deleted meanwhile are skipped"""
+    for user_id in set(Cart.objects.filter(pk__in=cart_ids).values_list("user_id", flat=True)):
+        count_cart_items(user_id)
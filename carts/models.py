@@ -26,6 +26,14 @@ class CartItem(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField(default=1)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["cart", "product"],
+                name="unique_cart_item_product",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.quantity} × {self.product.name}"
 
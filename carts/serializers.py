@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from carts.models import CartItem, Cart
+from products.fieldsets import ExpandableFieldsMixin
+from products.serializers import ProductSerializer
 
 
-class CartItemSerializer(serializers.ModelSerializer):
+class CartItemSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     price = serializers.DecimalField(
         source="product.price",
         max_digits=10,
@@ -10,6 +12,8 @@ class CartItemSerializer(serializers.ModelSerializer):
         read_only=True
     )
     total_price = serializers.SerializerMethodField()
+    expandable_fields = {"product": (ProductSerializer, {})}
+    field_sources = {"total_price": ("quantity", "product.price")}
 
     class Meta:
         model = CartItem
@@ -20,11 +24,12 @@ class CartItemSerializer(serializers.ModelSerializer):
 
 
 
-class CartSerializer(serializers.ModelSerializer):
+class CartSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     items = CartItemSerializer(many=True, read_only=True)
     total_price = serializers.DecimalField(
         max_digits=10, decimal_places=2, read_only=True
     )
+    expandable_fields = {"items": (CartItemSerializer, {"many": True})}
 
     class Meta:
         model = Cart
@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .badge import refresh_cart_counts
+from .models import CartItem
+
+
+def _schedule_count_refresh(instance, using):
+    cart_ids = [instance.cart_id]
+    transaction.on_commit(lambda: refresh_cart_counts(cart_ids), using=using)
+
+
+@receiver(post_save, sender=CartItem, dispatch_uid="cart_count_save")
+def refresh_count_on_add(sender, instance, created, using, **kwargs):
+    # The badge counts lines, so a quantity change leaves it as it is.
+    if created:
+        _schedule_count_refresh(instance, using)
+
+
+@receiver(post_delete, sender=CartItem, dispatch_uid="cart_count_delete")
+def refresh_count_on_remove(sender, instance, using, **kwargs):
+    _schedule_count_refresh(instance, using)
@@ -1,3 +1,97 @@
-from django.test import TestCase
+import threading
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.db import close_old_connections, connection
+from django.test import TransactionTestCase
+
+from products.models import Category, Product
+from .adding import InsufficientStock, add_to_cart, set_quantity
+from .badge import cart_item_count
+from .models import Cart, CartItem
+
+
+class AddToCartTests(TransactionTestCase):
+    def setUp(self):
+        self.user = user = User.objects.create_user("shopper", password="pw")
+        self.cart = Cart.objects.create(user=user)
+        category = Category.objects.create(name="Hardware")
+        self.product = Product.objects.create(name="Widget", price=5, stock=1000, category=category)
+
+    def hammer(self, threads, adds, quantity=1):
+        """Call add_to_cart from `threads` threads at once, `adds` times each; returns the outcomes"""
+        barrier = threading.Barrier(threads)
+        outcomes, lock = [], threading.Lock()
+
+        def worker():
+            barrier.wait()
+            try:
+                for _ in range(adds):
+                    try:
+                        add_to_cart(self.cart, self.product.pk, quantity)
+                        outcome = "added"
+                    except InsufficientStock:
+                        outcome = "refused"
+                    with lock:
+                        outcomes.append(outcome)
+            finally:
+                close_old_connections()
+                connection.close()
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return outcomes
+
+    def test_concurrent_adds_are_not_lost(self):
+        outcomes = self.hammer(threads=8, adds=25)
+
+        self.assertEqual(outcomes.count("added"), 200)
+        item = CartItem.objects.get(cart=self.cart, product=self.product)
+        self.assertEqual(item.quantity, 200)
+
+    def test_concurrent_adds_stop_at_stock(self):
+        Product.objects.filter(pk=self.product.pk).update(stock=30)
+
+        outcomes = self.hammer(threads=8, adds=10, quantity=2)
+
+        self.assertEqual(outcomes.count("added"), 15)
+        item = CartItem.objects.get(cart=self.cart, product=self.product)
+        self.assertEqual(item.quantity, 30)
+
+    def test_add_checks_stock_and_product(self):
+        with self.assertRaises(InsufficientStock):
+            add_to_cart(self.cart, self.product.pk, 1001)
+        with self.assertRaises(Product.DoesNotExist):
+            add_to_cart(self.cart, self.product.pk + 1, 1)
+        self.assertFalse(CartItem.objects.exists())
+
+        first = add_to_cart(self.cart, self.product.pk, 3)
+        second = add_to_cart(self.cart, self.product.pk, 4)
+
+        self.assertEqual(first, second)
+        self.assertEqual(CartItem.objects.get(pk=first).quantity, 7)
+
+    def test_badge_counts_lines_added_again_after_removal(self):
+        item_id = add_to_cart(self.cart, self.product.pk, 2)
+        add_to_cart(self.cart, self.product.pk, 1)
+        self.assertEqual(cart_item_count(self.user.pk), 1)
+
+        set_quantity(self.user, item_id, 0)
+        self.assertEqual(cart_item_count(self.user.pk), 0)
+
+        add_to_cart(self.cart, self.product.pk, 1)
+        self.assertEqual(cart_item_count(self.user.pk), 1)
+
+    def test_set_quantity_checks_stock_and_owner(self):
+        item_id = add_to_cart(self.cart, self.product.pk, 1)
+        other = User.objects.create_user("other", password="pw")
+
+        set_quantity(self.user, item_id, 1000)
+        with self.assertRaises(InsufficientStock):
+            set_quantity(self.user, item_id, 1001)
+        with self.assertRaises(CartItem.DoesNotExist):
+            set_quantity(other, item_id, 1)
+
+        self.assertEqual(CartItem.objects.get(pk=item_id).quantity, 1000)
@@ -2,23 +2,28 @@ from rest_framework import generics, permissions
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from django.views.decorators.http import require_POST
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from django.db import transaction
 import json
 
+from .adding import InsufficientStock, add_to_cart, set_quantity
 from .models import Cart, CartItem
 from .serializers import CartSerializer, CartItemSerializer
+from products.fieldsets import SparseFieldsetMixin
 from products.models import Product
 from orders.models import Order, OrderItem  
+from orders.rollups import record_order_sales
 
 
 
-class CartDetailView(generics.RetrieveAPIView):
+class CartDetailView(SparseFieldsetMixin, generics.RetrieveAPIView):
     serializer_class = CartSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        cart, _ = Cart.objects.get_or_create(user=self.request.user)
+        cart = self.filter_queryset(Cart.objects.filter(user=self.request.user)).first()
+        if cart is None:
+            cart = Cart.objects.create(user=self.request.user)
         return cart
 
 
@@ -27,19 +32,23 @@ class AddToCartView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, *args, **kwargs):
-        cart, _ = Cart.objects.get_or_create(user=request.user)
-        product_id = request.data.get("product")
-        quantity = int(request.data.get("quantity", 1))
-
-        product = get_object_or_404(Product, id=product_id)
-
-        cart_item, created = CartItem.objects.get_or_create(
-            cart=cart,
-            product=product
-        )
-        cart_item.quantity += quantity
-        cart_item.save()
+        try:
+            product_id = int(request.data.get("product"))
+            quantity = int(request.data.get("quantity", 1))
+        except (TypeError, ValueError):
+            return Response({"error": "product and quantity must be integers"}, status=400)
+        if quantity < 1:
+            return Response({"error": "quantity must be at least 1"}, status=400)
 
+        cart, _ = Cart.objects.get_or_create(user=request.user)
+        try:
+            item_id = add_to_cart(cart, product_id, quantity)
+        except Product.DoesNotExist:
+            raise Http404("No Product matches the given query.")
+        except InsufficientStock:
+            return Response({"error": "Insufficient stock"}, status=400)
+
+        cart_item = CartItem.objects.select_related("product").get(pk=item_id)
         serializer = CartItemSerializer(cart_item)
         return Response(serializer.data)
 
@@ -61,15 +70,10 @@ def UpdateCartItemQuantityView(request):
         data = json.loads(request.body)
         item_id = data.get("item_id")
         quantity = int(data.get("quantity", 1))
-        cart_item = get_object_or_404(CartItem, id=item_id, cart__user=request.user)
-
-        if quantity < 1:
-            cart_item.delete()
-        else:
-            cart_item.quantity = quantity
-            cart_item.save()
-
+        set_quantity(request.user, item_id, quantity)
         return JsonResponse({"success": True})
+    except InsufficientStock:
+        return JsonResponse({"success": False, "error": "Insufficient stock"}, status=400)
     except Exception as e:
         return JsonResponse({"success": False, "error": str(e)}, status=400)
 
@@ -85,16 +89,22 @@ def CheckoutView(request):
         with transaction.atomic():
             order = Order.objects.create(user=request.user, status="Pending")
 
-            for item in cart.items.all():
-                OrderItem.objects.create(
+            items = list(cart.items.select_related("product"))
+            OrderItem.objects.bulk_create([
+                OrderItem(
                     order=order,
                     product=item.product,
                     quantity=item.quantity,
                     price=item.product.price
                 )
+                for item in items
+            ])
+            for item in items:
                 item.product.stock -= item.quantity
-                item.product.save()
+                item.product.save(update_fields=["stock", "updated_at"])
 
+            order.refresh_totals()
+            record_order_sales(order)
             cart.items.all().delete()  
 
         return JsonResponse({"success": True, "message": "Checkout completed successfully!"})
@@ -108,13 +108,68 @@ if DATABASE_URL:
         'default': dj_database_url.parse(DATABASE_URL, conn_max_age=600)
     }
 else:
+    # Transactions take SQLite's write lock at BEGIN, so concurrent writers
+    # wait for each other (up to `timeout` seconds) before running any
+    # statement instead of failing part-way. The test database is a file:
+    # the shared in-memory one locks per table and does not wait.
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': {
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': 20,
+            },
+            'TEST': {
+                'NAME': BASE_DIR / 'test_db.sqlite3',
+            },
         }
     }
 
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    # KPI, facet, page and catalog-version keys must be shared by every
+    # worker, so without Redis the cache lives in the database
+    # (table created by dashboard migration 0002).
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+            'OPTIONS': {
+                'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', 10000)),
+            },
+        }
+    }
+
+# Seconds a dashboard KPI snapshot may be served before it is recomputed
+DASHBOARD_KPI_CACHE_TIMEOUT = int(os.getenv('DASHBOARD_KPI_CACHE_TIMEOUT', 300))
+
+# Seconds the stock bucket counts on the product pages may be reused (0 disables)
+INVENTORY_SUMMARY_CACHE_TIMEOUT = int(os.getenv('INVENTORY_SUMMARY_CACHE_TIMEOUT', 30))
+PRODUCT_FACETS_CACHE_TIMEOUT = int(os.getenv('PRODUCT_FACETS_CACHE_TIMEOUT', 120))
+CATALOG_SNAPSHOT_MAX_AGE = int(os.getenv('CATALOG_SNAPSHOT_MAX_AGE', 300))
+# Seconds anonymous home/shop pages are served from the page cache (0 disables)
+STOREFRONT_PAGE_CACHE_TIMEOUT = int(os.getenv('STOREFRONT_PAGE_CACHE_TIMEOUT', 300))
+
+# Seconds a cached cart badge count is kept; rewritten on every cart change
+CART_COUNT_CACHE_TIMEOUT = int(os.getenv('CART_COUNT_CACHE_TIMEOUT', 86400))
+PRODUCT_VIEW_FLUSH_SIZE = int(os.getenv('PRODUCT_VIEW_FLUSH_SIZE', 100))
+PRODUCT_VIEW_FLUSH_INTERVAL = int(os.getenv('PRODUCT_VIEW_FLUSH_INTERVAL', 60))
+PRODUCT_IMAGE_WORKERS = int(os.getenv('PRODUCT_IMAGE_WORKERS', 2))
+PRODUCT_BULK_MAX_ITEMS = int(os.getenv('PRODUCT_BULK_MAX_ITEMS', 500))
+# Co-purchased products kept per product by build_recommendations
+PRODUCT_RECOMMENDATIONS_TOP_K = int(os.getenv('PRODUCT_RECOMMENDATIONS_TOP_K', 10))
+# Minutes an order must have existed before build_recommendations counts it,
+# so checkouts that are still committing are not passed over
+PRODUCT_RECOMMENDATIONS_LAG_MINUTES = int(os.getenv('PRODUCT_RECOMMENDATIONS_LAG_MINUTES', 5))
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -0,0 +1,71 @@
+from decimal import Decimal
+
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+from django.utils.timezone import now, timedelta
+
+from orders.models import DailySalesRollup, Order
+from products.models import Category
+
+PERIODS = ("all", "day", "week", "month")
+
+
+def period_start(period):
+    """Return the first date covered by a dashboard period, or None for 'all'"""
+    today = now().date()
+    if period == "day":
+        return today
+    if period == "week":
+        return today - timedelta(days=7)
+    if period == "month":
+        return today.replace(day=1)
+    return None
+
+
+def orders_for_period(start_date=None):
+    orders = Order.objects.all()
+    if start_date:
+        orders = orders.filter(created_at__date__gte=start_date)
+    return orders
+
+
+def rollup_for_period(start_date=None):
+    rollup = DailySalesRollup.objects.all()
+    if start_date:
+        rollup = rollup.filter(date__gte=start_date)
+    return rollup
+
+
+def total_sales(start_date=None):
+    total = rollup_for_period(start_date).aggregate(total=Sum("revenue"))["total"]
+    return total or Decimal("0.00")
+
+
+def sales_by_month(start_date=None):
+    """Sales per calendar month (Jan..Dec), summed across years like the chart expects"""
+    rows = (
+        rollup_for_period(start_date)
+        .annotate(month=TruncMonth("date"))
+        .values("month")
+        .annotate(total=Sum("revenue"))
+        .order_by()
+    )
+    totals = [0.0] * 12
+    for row in rows:
+        totals[row["month"].month - 1] += float(row["total"] or 0)
+    return totals
+
+
+def revenue_by_category(start_date=None):
+    """Return (labels, values) for every category, including ones without sales"""
+    rows = (
+        rollup_for_period(start_date)
+        .values("category_id")
+        .annotate(total=Sum("revenue"))
+        .order_by()
+    )
+    revenue = {row["category_id"]: row["total"] for row in rows}
+    categories = Category.objects.order_by("id").values_list("id", "name")
+    labels = [name for _, name in categories]
+    values = [float(revenue.get(pk) or 0) for pk, _ in categories]
+    return labels, values
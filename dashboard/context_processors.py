@@ -1,12 +1,16 @@
-from carts.models import Cart
+from functools import cache
+
+from carts.badge import cart_item_count
 
 
 def cart_context(request):
-    """Add cart count to all templates"""
-    cart_items_count = 0
-    if request.user.is_authenticated:
-        cart, _ = Cart.objects.get_or_create(user=request.user)
-        cart_items_count = cart.items.count()
+    """Add cart count to all templates, read from the cache only if a template renders it"""
+    @cache
+    def cart_items_count():
+        if not request.user.is_authenticated:
+            return 0
+        return cart_item_count(request.user.pk)
+
     return {
         'cart_items_count': cart_items_count,
     }
@@ -0,0 +1,190 @@
+"""
+Synthetic data for benchmarking.
+
+Everything is derived from a seed: users, products (log-normal prices,
+mixed stock levels), and orders whose products follow a Zipf popularity
+curve, whose customers are skewed towards repeat buyers, whose dates
+follow weekly and yearly seasonality, and whose carts range from one line
+to a dozen. Orders are generated in fixed-size chunks, each with its own
+seeded RNG, so the data is identical however many worker processes build
+it. Rows are written with bulk_create and order totals are computed in
+Python, so no backfill is needed afterwards.
+"""
+
+import itertools
+import math
+import random
+from bisect import bisect
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+
+from orders.models import Order, OrderItem
+from products.models import Category, Product
+
+CATEGORY_NAMES = (
+    "Electronics", "Clothing", "Books", "Home & Kitchen", "Sports & Outdoors", "Toys & Games",
+    "Beauty", "Grocery", "Garden", "Automotive", "Office", "Pet Supplies",
+)
+BRANDS = ("Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka", None)
+CENT = Decimal("0.01")
+
+_context = {}
+
+
+def name_prefix(seed):
+    return f"bench{seed}-"
+
+
+def _cumulative(weights):
+    return list(itertools.accumulate(weights))
+
+
+def zipf_weights(count, exponent, rng):
+    """Zipf weights for `count` items, assigned to items in a seeded random order"""
+    ranks = list(range(1, count + 1))
+    rng.shuffle(ranks)
+    return [1 / rank ** exponent for rank in ranks]
+
+
+def day_weights(start, days):
+    """Order volume per day: weekend bump, summer dip and a November/December peak"""
+    weights = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        weight = 1.0 + 0.25 * (day.weekday() >= 5)
+        weight *= 1.0 + 0.15 * math.cos(2 * math.pi * (day.timetuple().tm_yday - 15) / 365)
+        if day.month == 11 and day.day >= 20 or day.month == 12 and day.day <= 24:
+            weight *= 2.2
+        weights.append(weight)
+    return weights
+
+
+def _pick(rng, cumulative):
+    return bisect(cumulative, rng.random() * cumulative[-1])
+
+
+def create_users(seed, count, batch_size):
+    password = make_password(f"bench-{seed}")
+    prefix = name_prefix(seed)
+    for start in range(0, count, batch_size):
+        User.objects.bulk_create([
+            User(username=f"{prefix}{i:08d}", email=f"{prefix}{i:08d}@example.com", password=password)
+            for i in range(start, min(start + batch_size, count))
+        ])
+    return list(User.objects.filter(username__startswith=prefix).order_by("pk").values_list("pk", flat=True))
+
+
+def create_products(seed, count, batch_size, end):
+    rng = random.Random(f"{seed}-products")
+    Category.objects.bulk_create([Category(name=name) for name in CATEGORY_NAMES], ignore_conflicts=True)
+    category_ids = list(Category.objects.filter(name__in=CATEGORY_NAMES).values_list("pk", flat=True))
+    prefix = name_prefix(seed)
+    for start in range(0, count, batch_size):
+        batch = []
+        for i in range(start, min(start + batch_size, count)):
+            roll = rng.random()
+            stock = 0 if roll < 0.05 else rng.randint(1, 10) if roll < 0.2 else rng.randint(11, 500)
+            batch.append(Product(
+                sku=f"{prefix}{i:08d}",
+                name=f"{rng.choice(BRANDS) or 'Generic'} item {i}",
+                description=f"Synthetic benchmark product {i}",
+                price=Decimal(str(min(rng.lognormvariate(3.4, 0.9), 5000))).quantize(CENT),
+                stock=stock,
+                category_id=rng.choice(category_ids),
+                brand=rng.choice(BRANDS),
+                is_active=rng.random() < 0.95,
+                created_at=end - timedelta(seconds=rng.randint(0, 730 * 86400)),
+            ))
+        Product.objects.bulk_create(batch)
+    return list(
+        Product.objects.filter(sku__startswith=prefix).order_by("pk").values_list("pk", "price")
+    )
+
+
+def _status(rng, age_days):
+    if rng.random() < 0.05:
+        return "Cancelled"
+    if age_days > 14:
+        return "Completed"
+    return rng.choice(("Pending", "Processing", "Completed"))
+
+
+def _init_worker(context):
+    _context.update(context)
+    # Never share the parent's connection with a forked child.
+    connections.close_all()
+
+
+def generate_order_chunk(chunk):
+    """Build and insert orders [start, stop) of the dataset; returns (orders, items)"""
+    chunk_index, start, stop = chunk
+    ctx = _context
+    rng = random.Random(f"{ctx['seed']}-orders-{chunk_index}")
+    product_ids, prices = ctx["product_ids"], ctx["prices"]
+    orders, lines = [], []
+    for _ in range(start, stop):
+        day = ctx["start"] + timedelta(days=_pick(rng, ctx["day_weights"]))
+        created_at = datetime.combine(day, time(), tzinfo=dt_timezone.utc) + timedelta(
+            seconds=rng.randint(0, 86399)
+        )
+        size = 1 + min(int(rng.expovariate(0.6)), 11)
+        picked = {}
+        for _ in range(size):
+            index = _pick(rng, ctx["product_weights"])
+            picked[index] = picked.get(index, 0) + (1 if rng.random() < 0.8 else rng.randint(2, 4))
+        items = [(product_ids[i], prices[i], quantity) for i, quantity in picked.items()]
+        orders.append(Order(
+            user_id=ctx["user_ids"][_pick(rng, ctx["user_weights"])],
+            status=_status(rng, (ctx["end"].date() - day).days),
+            created_at=created_at,
+            total_amount=sum(price * quantity for _, price, quantity in items),
+            item_count=sum(quantity for _, _, quantity in items),
+        ))
+        lines.append(items)
+    with transaction.atomic():
+        Order.objects.bulk_create(orders, batch_size=ctx["batch_size"])
+        OrderItem.objects.bulk_create(
+            [
+                OrderItem(order_id=order.pk, product_id=product_id, price=price, quantity=quantity)
+                for order, items in zip(orders, lines)
+                for product_id, price, quantity in items
+            ],
+            batch_size=ctx["batch_size"],
+        )
+    return len(orders), sum(len(items) for items in lines)
+
+
+def order_chunks(count, chunk_size):
+    return [
+        (index, start, min(start + chunk_size, count))
+        for index, start in enumerate(range(0, count, chunk_size))
+    ]
+
+
+def order_context(seed, user_ids, products, days, end, batch_size):
+    rng = random.Random(f"{seed}-popularity")
+    start = end.date() - timedelta(days=days - 1)
+    return {
+        "seed": seed,
+        "batch_size": batch_size,
+        "start": start,
+        "end": end,
+        "user_ids": user_ids,
+        "user_weights": _cumulative(zipf_weights(len(user_ids), 0.8, rng)),
+        "product_ids": [pk for pk, _ in products],
+        "prices": [price for _, price in products],
+        "product_weights": _cumulative(zipf_weights(len(products), 1.1, rng)),
+        "day_weights": _cumulative(day_weights(start, days)),
+    }
+
+
+def clear_dataset(seed):
+    """Delete the users and products (and with them the orders) generated for `seed`"""
+    prefix = name_prefix(seed)
+    Order.objects.filter(user__username__startswith=prefix).delete()
+    User.objects.filter(username__startswith=prefix).delete()
+    Product.objects.filter(sku__startswith=prefix).delete()
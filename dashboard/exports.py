@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+from django.utils.dateparse import parse_date
+
+from orders.models import Order
+
+ORDER_CSV_HEADER = ["ID", "Customer", "Date", "Total", "Status"]
+CENTS = Decimal("0.01")
+
+
+class Echo:
+    """File-like object whose write() hands the row back to the caller"""
+    def write(self, value):
+        return value
+
+
+def date_param(params, name):
+    """The YYYY-MM-DD date in params[name], or None when missing, malformed or impossible (2024-02-30)"""
+    try:
+        return parse_date(params.get(name) or "")
+    except ValueError:
+        return None
+
+
+def filter_orders(params):
+    """Apply the start/end (YYYY-MM-DD) and status filters used by order exports"""
+    orders = Order.objects.all()
+    start = date_param(params, "start")
+    end = date_param(params, "end")
+    status = params.get("status", "")
+    if start:
+        orders = orders.filter(created_at__date__gte=start)
+    if end:
+        orders = orders.filter(created_at__date__lte=end)
+    if status in dict(Order.STATUS_CHOICES):
+        orders = orders.filter(status=status)
+    return orders
+
+
+def order_csv_rows(orders, chunk_size=2000):
+    """Yield CSV rows for `orders`, streaming them from a server-side cursor"""
+    rows = (
+        orders.order_by("id")
+        .values_list("id", "user__username", "created_at", "total_amount", "status")
+        .iterator(chunk_size=chunk_size)
+    )
+    for order_id, username, created_at, total, status in rows:
+        yield [
+            order_id,
+            username or "Guest",
+            created_at.strftime("%Y-%m-%d"),
+            Decimal(total).quantize(CENTS),
+            status,
+        ]
@@ -0,0 +1,82 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import F
+
+from products.models import Product
+from . import analytics
+
+VERSION_KEY = "dashboard:kpi:version"
+KPI_KEY = "dashboard:kpi:{period}:{start_date}"
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def cache_stats():
+    """Hit/miss counters for this worker process"""
+    with _stats_lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 3) if lookups else None,
+    }
+
+
+def compute_kpis(period):
+    start_date = analytics.period_start(period)
+    orders = analytics.orders_for_period(start_date).order_by("-created_at")
+    revenue_labels, revenue_data = analytics.revenue_by_category(start_date)
+    return {
+        "users_count": User.objects.count(),
+        "products_count": Product.objects.count(),
+        "orders_count": orders.count(),
+        "total_sales": float(analytics.total_sales(start_date)),
+        # Plain values only: the entry lives in the shared cache, so no model
+        # instances (and no user password hashes or emails) are pickled into it.
+        "recent_orders": list(
+            orders.values("id", "total_amount", "status", "created_at", username=F("user__username"))[:5]
+        ),
+        "sales_by_month": analytics.sales_by_month(start_date),
+        "revenue_labels": revenue_labels,
+        "revenue_data": revenue_data,
+    }
+
+
+def get_kpis(period):
+    """Return the dashboard KPIs for `period`, served from the cache when still current"""
+    if period not in analytics.PERIODS:
+        period = "all"
+    key = KPI_KEY.format(period=period, start_date=analytics.period_start(period))
+    cached = cache.get_many([VERSION_KEY, key])
+    version = cached.get(VERSION_KEY)
+    entry = cached.get(key)
+    if version is not None and entry is not None and entry[0] == version:
+        _count("hits")
+        return entry[1]
+    _count("misses")
+    if version is None:
+        version = time.time_ns()
+        cache.add(VERSION_KEY, version, None)
+        version = cache.get(VERSION_KEY, version)
+    kpis = compute_kpis(period)
+    cache.set(key, (version, kpis), getattr(settings, "DASHBOARD_KPI_CACHE_TIMEOUT", 300))
+    return kpis
+
+
+def invalidate_kpis():
+    """Retire every cached period at once by moving to a new version"""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), None)
@@ -0,0 +1,125 @@
+"""
+Management command to EXPLAIN the hot storefront/dashboard queries.
+
+Each query is replayed against the current database and its plan printed.
+Full table scans (SQLite "SCAN <table>", PostgreSQL "Seq Scan on <table>")
+of tables holding at least --min-rows rows are flagged, and the command
+exits non-zero so an index regression fails the deploy. Planners only
+pick selective indexes once they have statistics; pass --analyze on a
+fresh database.
+
+Usage:
+    python manage.py audit_queries
+    python manage.py audit_queries --analyze
+    python manage.py audit_queries --min-rows 500 --quiet
+"""
+
+import re
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from carts.models import Cart, CartItem
+from orders.models import DailySalesRollup, Order
+from products.facets import storefront_filters, storefront_products
+from products.inventory import LOW_STOCK_THRESHOLD
+from products.models import Category, Product
+
+SCAN_PATTERNS = (
+    re.compile(r"\bSCAN (?P<table>\w+)(?P<rest>.*)$"),
+    re.compile(r"\bSeq Scan on (?P<table>\w+)(?P<rest>)"),
+)
+
+
+def audited_queries():
+    """(label, queryset, full_scan_expected) for the queries behind each view"""
+    user_id = User.objects.order_by("pk").values_list("pk", flat=True).first() or 0
+    category = Category.objects.order_by("pk").first()
+    category_id = category.pk if category else 0
+    category_name = category.name if category else ""
+    active = Product.objects.filter(is_active=True, stock__gt=0)
+    month_ago = timezone.now() - timedelta(days=30)
+    shop_filters = dict(storefront_filters({}), category=category_name, min_price=10, max_price=100)
+
+    return [
+        ("catalog snapshot: active products", active.order_by("name", "id"), True),
+        ("home: newest in stock", active.order_by("-created_at")[:8], False),
+        ("shop: category and price range", storefront_products(shop_filters).order_by("price", "id")[:20], False),
+        ("products_list: low stock", Product.objects.filter(stock__gt=0, stock__lte=LOW_STOCK_THRESHOLD), False),
+        ("products api: category by price", Product.objects.filter(category_id=category_id).order_by("price", "id")[:20], False),
+        ("orders_list: customer orders", Order.objects.filter(user_id=user_id).order_by("-created_at", "-id")[:10], False),
+        ("orders_list: pending orders", Order.objects.filter(status="Pending").order_by("-created_at"), False),
+        ("reports: completed orders this month", Order.objects.filter(status="Completed", created_at__gte=month_ago), False),
+        ("admin_dashboard: sales this month", DailySalesRollup.objects.filter(date__gte=month_ago.date()), False),
+        ("cart: lookup by user", Cart.objects.filter(user_id=user_id), False),
+        ("cart: items for user", CartItem.objects.filter(cart__user_id=user_id).select_related("product"), False),
+    ]
+
+
+def scanned_tables(plan):
+    tables = []
+    for line in plan.splitlines():
+        for pattern in SCAN_PATTERNS:
+            match = pattern.search(line)
+            if match and "USING" not in match.group("rest"):
+                tables.append(match.group("table"))
+    return tables
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the storefront and dashboard queries and flag full table scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-rows',
+            type=int,
+            default=1000,
+            help='Only flag scans of tables with at least this many rows',
+        )
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Run ANALYZE first so the planner has table statistics',
+        )
+        parser.add_argument(
+            '--quiet',
+            action='store_true',
+            help='Print flagged queries only, without their plans',
+        )
+
+    def table_rows(self, table, counts):
+        if table not in counts:
+            with connection.cursor() as cursor:
+                known = table in connection.introspection.table_names(cursor)
+                if known:
+                    cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+                counts[table] = cursor.fetchone()[0] if known else 0
+        return counts[table]
+
+    def handle(self, *args, **options):
+        if options['analyze']:
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        counts = {}
+        flagged = []
+        for label, queryset, scan_expected in audited_queries():
+            plan = queryset.explain()
+            scans = [
+                (table, self.table_rows(table, counts)) for table in scanned_tables(plan)
+            ]
+            scans = [(table, rows) for table, rows in scans if rows >= options['min_rows']]
+            if not options['quiet']:
+                self.stdout.write(self.style.MIGRATE_HEADING(label))
+                for line in plan.splitlines():
+                    self.stdout.write(f'    {line}')
+            if scans and not scan_expected:
+                flagged.append(label)
+                for table, rows in scans:
+                    self.stdout.write(self.style.ERROR(f'  ✗ {label}: full scan of {table} ({rows} rows)'))
+
+        if flagged:
+            raise CommandError(f'{len(flagged)} query(s) scan large tables without an index')
+        self.stdout.write(self.style.SUCCESS(f'✓ No unexpected full scans (threshold {options["min_rows"]} rows)'))
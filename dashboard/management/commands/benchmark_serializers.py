@@ -0,0 +1,70 @@
+"""
+Management command to compare the DRF serializers with the fast list path.
+
+For products and orders the same page of rows is rendered both ways, the
+output is checked to be byte-for-byte identical JSON, and the best time of
+--repeat runs (database reads included) is reported. Image URLs are
+rendered relative, as there is no request. Load data first, e.g. with
+generate_dataset.
+
+Usage:
+    python manage.py benchmark_serializers
+    python manage.py benchmark_serializers --rows 100 --repeat 10
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from orders.models import Order
+from orders.serializers import OrderListSerializer, OrderSerializer
+from products.models import Product
+from products.serializers import ProductListSerializer, ProductSerializer
+
+
+def _best(repeat, render):
+    timings, data = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = render()
+        timings.append(time.perf_counter() - start)
+    return min(timings), JSONRenderer().render(data)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark ModelSerializer list rendering against the values()-based fast path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Rows per page')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per path; the best is reported')
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        cases = [
+            ('products', Product.objects.order_by('pk'), ProductSerializer, ProductListSerializer),
+            ('orders', Order.objects.order_by('pk'), OrderSerializer, OrderListSerializer),
+        ]
+        for label, queryset, serializer_class, fast_class in cases:
+            page = queryset[:rows]
+
+            def slow():
+                return serializer_class(list(page), many=True).data
+
+            def fast():
+                serializer = fast_class()
+                return serializer.serialize(page.values(*serializer.columns()))
+
+            slow_time, slow_json = _best(repeat, slow)
+            fast_time, fast_json = _best(repeat, fast)
+            if slow_json != fast_json:
+                raise CommandError(f'{label}: fast path output differs from {serializer_class.__name__}')
+            count = len(page)
+            speedup = slow_time / fast_time if fast_time else float('inf')
+            self.stdout.write(
+                f'{label:<10} {count:>6} rows  '
+                f'{serializer_class.__name__}: {slow_time * 1000:8.1f} ms  '
+                f'{fast_class.__name__}: {fast_time * 1000:8.1f} ms  '
+                f'{speedup:5.1f}x'
+            )
+        self.stdout.write(self.style.SUCCESS('✓ Fast path output matches the serializers'))
@@ -0,0 +1,121 @@
+"""
+Management command to generate a large, reproducible benchmark dataset.
+
+The same --seed, --end-date and --chunk-size always produce the same
+rows, whatever --workers is. Generated users and products are prefixed with
+"bench<seed>-", so --clear removes exactly what an earlier run created.
+SQLite allows a single writer, so it always runs with one worker.
+
+Usage:
+    python manage.py generate_dataset --users 10000 --products 50000 --orders 1000000
+    python manage.py generate_dataset --orders 200000 --workers 8 --seed 7 --end-date 2025-12-31
+    python manage.py generate_dataset --seed 7 --clear
+"""
+
+import multiprocessing
+import time
+from datetime import datetime, time as dt_time, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils.dateparse import parse_date
+
+from dashboard import dataset
+from dashboard.kpis import invalidate_kpis
+from orders.rollups import rebuild_sales_rollup
+from products.category_stats import refresh_category_stats
+from products.search import get_search_backend
+from products.snapshot import bump_catalog_version
+
+
+class Command(BaseCommand):
+    help = 'Bulk-generate users, products and orders with realistic distributions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Number of users to create')
+        parser.add_argument('--products', type=int, default=5000, help='Number of products to create')
+        parser.add_argument('--orders', type=int, default=50000, help='Number of orders to create')
+        parser.add_argument('--days', type=int, default=730, help='Spread order dates over this many days')
+        parser.add_argument('--end-date', help='Date of the newest orders, YYYY-MM-DD (default: today)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help='Worker processes inserting orders',
+        )
+        parser.add_argument('--chunk-size', type=int, default=10000, help='Orders generated per work unit')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per INSERT statement')
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete the data previously generated with this seed and exit',
+        )
+
+    def handle(self, *args, **options):
+        seed = options['seed']
+        if options['clear']:
+            dataset.clear_dataset(seed)
+            self.finish()
+            self.stdout.write(self.style.SUCCESS(f'✓ Removed the dataset generated with seed {seed}'))
+            return
+
+        if not connection.features.can_return_rows_from_bulk_insert:
+            raise CommandError('This database cannot return primary keys from bulk inserts')
+        prefix = dataset.name_prefix(seed)
+        if dataset.User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError(f'A dataset for seed {seed} already exists; use --clear first or another --seed')
+        if options['users'] < 1 or options['products'] < 1:
+            raise CommandError('--users and --products must be at least 1')
+
+        end_date = parse_date(options['end_date']) if options['end_date'] else datetime.now(dt_timezone.utc).date()
+        if end_date is None:
+            raise CommandError('--end-date must be YYYY-MM-DD')
+        end = datetime.combine(end_date, dt_time.max, tzinfo=dt_timezone.utc)
+        workers = max(1, options['workers'])
+        if connection.vendor == 'sqlite' and workers > 1:
+            self.stdout.write(self.style.WARNING('SQLite allows one writer at a time; using 1 worker'))
+            workers = 1
+        batch_size = options['batch_size']
+
+        started = time.monotonic()
+        user_ids = dataset.create_users(seed, options['users'], batch_size)
+        self.stdout.write(f'  {len(user_ids)} users ({time.monotonic() - started:.1f}s)')
+        products = dataset.create_products(seed, options['products'], batch_size, end)
+        self.stdout.write(f'  {len(products)} products ({time.monotonic() - started:.1f}s)')
+
+        context = dataset.order_context(seed, user_ids, products, options['days'], end, batch_size)
+        chunks = dataset.order_chunks(options['orders'], options['chunk_size'])
+        if workers == 1:
+            dataset._context.update(context)
+            results = map(dataset.generate_order_chunk, chunks)
+            self.write_progress(results, started, options['orders'])
+        else:
+            connections.close_all()
+            pool_context = multiprocessing.get_context('fork')
+            with pool_context.Pool(workers, initializer=dataset._init_worker, initargs=(context,)) as pool:
+                self.write_progress(pool.imap_unordered(dataset.generate_order_chunk, chunks), started, options['orders'])
+
+        self.stdout.write('Rebuilding the sales rollup and search index...')
+        self.finish()
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Generated {len(user_ids)} users, {len(products)} products and '
+            f'{options["orders"]} orders in {time.monotonic() - started:.1f}s'
+        ))
+
+    def write_progress(self, results, started, total):
+        orders = items = 0
+        for chunk_orders, chunk_items in results:
+            orders += chunk_orders
+            items += chunk_items
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'  {orders}/{total} orders, {items} items ({orders / elapsed:,.0f} orders/s)'
+            )
+
+    def finish(self):
+        rebuild_sales_rollup()
+        get_search_backend().rebuild()
+        refresh_category_stats()
+        bump_catalog_version()
+        invalidate_kpis()
@@ -0,0 +1,60 @@
+"""
+Management command that processes queued report jobs.
+
+Usage:
+    python manage.py run_report_worker
+    python manage.py run_report_worker --once
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from dashboard.reports import claim_next_job, run_job
+
+
+class Command(BaseCommand):
+    help = 'Generate queued reports into MEDIA_ROOT/reports/'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process the current queue and exit instead of polling',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to sleep when the queue is empty',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Rows fetched and written per chunk',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Report worker started'))
+        try:
+            while True:
+                job = claim_next_job()
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+                self.stdout.write(f'Running {job}...')
+                started = time.monotonic()
+                try:
+                    run_job(job, chunk_size=options['chunk_size'])
+                except Exception as e:
+                    self.stderr.write(self.style.ERROR(f'  ✗ Report #{job.pk} failed: {e}'))
+                    continue
+                job.refresh_from_db()
+                elapsed = time.monotonic() - started
+                self.stdout.write(self.style.SUCCESS(
+                    f'  ✓ Report #{job.pk}: {job.rows_written} rows in {elapsed:.1f}s'
+                ))
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Report worker stopped'))
@@ -0,0 +1,84 @@
+"""
+Full-page cache for anonymous storefront views.
+
+Anonymous GETs of the home and shop pages render identical HTML for the
+same query string, so the rendered body is kept in the shared cache under
+the view name, the catalog version and the normalised query parameters.
+Any Product/Category write bumps the catalog version and with it every
+key. Requests are rendered normally (and not stored) when the visitor is
+logged in, has pending messages, or passes parameters the view does not
+know about. The cart badge is fetched from cart_badge, so no page depends
+on who is looking at it.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from products.snapshot import catalog_version
+
+PAGE_KEY = "dashboard:page:{view}:{version}:{digest}"
+
+
+def cache_timeout():
+    return getattr(settings, "STOREFRONT_PAGE_CACHE_TIMEOUT", 300)
+
+
+def normalized_query(params, allowed):
+    """Sorted non-empty (name, value) pairs, or None if an unknown parameter is present"""
+    if any(name not in allowed for name in params):
+        return None
+    return sorted(
+        (name, value.strip())
+        for name in params
+        for value in params.getlist(name)
+        if value.strip()
+    )
+
+
+def _cacheable(request):
+    return (
+        request.method in ("GET", "HEAD")
+        and not request.user.is_authenticated
+        and not len(messages.get_messages(request))
+        and cache_timeout() > 0
+    )
+
+
+def cache_anonymous_page(params=()):
+    """Serve anonymous GETs of the decorated view from the page cache"""
+    allowed = frozenset(params)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            query = normalized_query(request.GET, allowed) if _cacheable(request) else None
+            if query is None:
+                return view(request, *args, **kwargs)
+            digest = hashlib.md5(repr(query).encode()).hexdigest()
+            key = PAGE_KEY.format(view=view.__name__, version=catalog_version(), digest=digest)
+            entry = cache.get(key)
+            if entry is not None:
+                content, content_type = entry
+                response = HttpResponse(content, content_type=content_type)
+            else:
+                response = view(request, *args, **kwargs)
+                # Never replay a page carrying a CSRF token or setting cookies.
+                if (
+                    response.status_code == 200
+                    and not response.streaming
+                    and not response.cookies
+                    and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+                ):
+                    cache.set(key, (response.content, response["Content-Type"]), cache_timeout())
+            patch_vary_headers(response, ("Cookie",))
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,90 @@
+import csv
+import itertools
+import os
+
+from django.conf import settings
+from django.utils.timezone import now
+
+from orders.models import DailySalesRollup
+from . import exports
+from .models import ReportJob
+
+REPORT_PARAMS = ("start", "end", "status")
+
+
+def orders_report(params, chunk_size):
+    yield exports.ORDER_CSV_HEADER
+    yield from exports.order_csv_rows(exports.filter_orders(params), chunk_size=chunk_size)
+
+
+def daily_sales_report(params, chunk_size):
+    rollup = DailySalesRollup.objects.all()
+    start = exports.date_param(params, "start")
+    end = exports.date_param(params, "end")
+    if start:
+        rollup = rollup.filter(date__gte=start)
+    if end:
+        rollup = rollup.filter(date__lte=end)
+    if params.get("status"):
+        rollup = rollup.filter(status=params["status"])
+    yield ["Date", "Category", "Status", "Revenue", "Units", "Orders"]
+    yield from (
+        rollup.order_by("date", "category__name", "status")
+        .values_list("date", "category__name", "status", "revenue", "units", "order_count")
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+REPORT_GENERATORS = {
+    "orders": orders_report,
+    "daily_sales": daily_sales_report,
+}
+
+
+def enqueue_report(report_type, params, user=None):
+    params = {key: params[key] for key in REPORT_PARAMS if params.get(key)}
+    return ReportJob.objects.create(report_type=report_type, params=params, requested_by=user)
+
+
+def claim_next_job():
+    """Atomically move the oldest queued job to Running; None when the queue is empty"""
+    while True:
+        job = ReportJob.objects.filter(status="Queued").order_by("created_at", "id").first()
+        if job is None:
+            return None
+        claimed = ReportJob.objects.filter(pk=job.pk, status="Queued").update(
+            status="Running", started_at=now()
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def run_job(job, chunk_size=5000):
+    """Write the job's CSV under MEDIA_ROOT/reports/ one chunk of rows at a time"""
+    relative_path = f"reports/{job.report_type}-{job.pk}.csv"
+    path = os.path.join(settings.MEDIA_ROOT, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    rows = REPORT_GENERATORS[job.report_type](job.params, chunk_size)
+    written = 0
+    try:
+        with open(path, "w", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(next(rows))
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if not chunk:
+                    break
+                writer.writerows(chunk)
+                written += len(chunk)
+                ReportJob.objects.filter(pk=job.pk).update(rows_written=written)
+    except Exception as e:
+        if os.path.exists(path):
+            os.remove(path)
+        ReportJob.objects.filter(pk=job.pk).update(
+            status="Failed", error=str(e), rows_written=written, finished_at=now()
+        )
+        raise
+    ReportJob.objects.filter(pk=job.pk).update(
+        status="Completed", file=relative_path, rows_written=written, finished_at=now()
+    )
@@ -0,0 +1,34 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from orders.models import Order, OrderItem
+from orders.signals import sales_rollup_changed
+from products.models import Category, Product
+from products.signals import products_bulk_changed
+from .kpis import invalidate_kpis
+
+KPI_MODELS = (Order, OrderItem, Product, Category, User)
+
+
+def _schedule_invalidation(sender, **kwargs):
+    update_fields = kwargs.get("update_fields")
+    if sender is User and update_fields and set(update_fields) <= {"last_login"}:
+        return
+    transaction.on_commit(invalidate_kpis)
+
+
+for model in KPI_MODELS:
+    post_save.connect(_schedule_invalidation, sender=model, dispatch_uid=f"kpi_save_{model.__name__}")
+    post_delete.connect(_schedule_invalidation, sender=model, dispatch_uid=f"kpi_delete_{model.__name__}")
+
+
+@receiver(sales_rollup_changed, dispatch_uid="kpi_sales_rollup_changed")
+def sales_rollup_changed_handler(sender, **kwargs):
+    transaction.on_commit(invalidate_kpis)
+
+
+@receiver(products_bulk_changed, dispatch_uid="kpi_products_bulk_changed")
+def products_bulk_changed_handler(sender, **kwargs):
+    transaction.on_commit(invalidate_kpis)
@@ -0,0 +1,13 @@
+# dashboard/templatetags/product_images.py
+from django import template
+
+from products.images import schedule_variants, variant_url, variants_current
+
+register = template.Library()
+
+@register.filter(name='image_variant')
+def image_variant(product, variant):
+    """Variant URL for a product image, queueing generation when it is missing"""
+    if product.image and not variants_current(product):
+        schedule_variants(product.pk, retry=False)
+    return variant_url(product, variant)
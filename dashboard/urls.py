@@ -4,7 +4,11 @@ from . import views
 urlpatterns = [
     path('', views.home_view, name="home"),
     path('admin-dashboard/', views.admin_dashboard, name="dashboard_home"),
+    path('admin-dashboard/kpi-cache/', views.kpi_cache_stats_view, name="kpi_cache_stats"),
     path('reports/', views.reports_view, name='reports_view'),
+    path('reports/jobs/', views.report_job_create, name='report_job_create'),
+    path('reports/jobs/<int:pk>/', views.report_job_status, name='report_job_status'),
+    path('reports/jobs/<int:pk>/download/', views.report_job_download, name='report_job_download'),
     path('users/', views.users_list, name="users_list"),
     path('users/<int:pk>/role/', views.user_update_role, name="user_update_role"),
     path('users/<int:pk>/delete/', views.admin_user_delete, name="admin_user_delete"),
@@ -25,6 +29,8 @@ urlpatterns = [
     path('orders/<int:pk>/delete/', views.order_delete, name='order_delete'),
     path('orders/export/csv/', views.export_orders_csv, name='export_orders_csv'),
     path('cart/', views.cart_page, name='cart_page'),
+    path('cart/badge/', views.cart_badge, name='cart_badge'),
+    path('cart/add/', views.cart_add, name='cart_add'),
     path('cart/clear/', views.clear_cart, name='clear_cart'),
     path('cart/remove/<int:item_id>/', views.remove_from_cart, name='remove_from_cart'),
     path('shop/', views.shop_view, name='shop'),
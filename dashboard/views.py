@@ -4,67 +4,110 @@ from django.contrib.auth import authenticate, login, logout, update_session_auth
 from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.models import User
-from django.utils.timezone import now, timedelta
-from django.core.paginator import Paginator
-from django.http import HttpResponse, JsonResponse
+from django.views.decorators.cache import never_cache
+from django.http import FileResponse, Http404, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+import copy
 import csv
+import itertools
 import json
+import os
 from users.forms import UserUpdateForm, CustomPasswordChangeForm, CustomUserCreationForm
 from users.forms import ProductForm, OrderForm
 from orders.models import Order, OrderItem
+from orders.recommendations import recommendations_for
+from orders.rollups import record_order_sales, track_order_sales
+from carts.adding import InsufficientStock, add_to_cart
+from carts.badge import cart_item_count
 from carts.models import Cart, CartItem
 from products.models import Product, Category
+from products.inventory import stock_summary
+from products.facets import PRICE_BANDS, get_facets, matches_storefront_filters, storefront_filters, storefront_products
+from products.pagination import paginate_request, paginate_request_list
+from products.snapshot import get_catalog
+from products.search import search_products
+from . import analytics, exports, reports
+from .kpis import cache_stats as kpi_cache_stats, get_kpis
+from .models import ReportJob
+from .page_cache import cache_anonymous_page
 
 @login_required
 @user_passes_test(lambda u: u.is_staff)
 def admin_dashboard(request):
     period = request.GET.get("period", "all")
-    today = now().date()
-    start_date = None
-    if period == "day":
-        start_date = today
-    elif period == "week":
-        start_date = today - timedelta(days=7)
-    elif period == "month":
-        start_date = today.replace(day=1)
-    orders = Order.objects.all().order_by("-created_at")
-    if start_date:
-        orders = orders.filter(created_at__date__gte=start_date)
-    total_sales = sum(order.total_amount for order in orders)
-    sales_by_month = []
-    for month in range(1, 13):
-        monthly_orders = orders.filter(created_at__month=month)
-        month_total = sum(sum(item.price * item.quantity for item in order.items.all()) for order in monthly_orders)
-        sales_by_month.append(float(month_total))
-    categories = Category.objects.all()
-    revenue_data = []
-    for category in categories:
-        category_total = sum(
-            item.price * item.quantity
-            for order in orders
-            for item in order.items.all()
-            if item.product.category == category
-        )
-        revenue_data.append(float(category_total))
+    kpis = get_kpis(period)
     context = {
-        "users_count": User.objects.count(),
-        "products_count": Product.objects.count(),
-        "orders_count": orders.count(),
-        "total_sales": float(total_sales),
+        "users_count": kpis["users_count"],
+        "products_count": kpis["products_count"],
+        "orders_count": kpis["orders_count"],
+        "total_sales": kpis["total_sales"],
         "period": period,
-        "recent_orders": orders[:5],
-        "sales_by_month_json": json.dumps(sales_by_month),
-        "revenue_labels_json": json.dumps([c.name for c in categories]),
-        "revenue_data_json": json.dumps(revenue_data),
+        "recent_orders": kpis["recent_orders"],
+        "sales_by_month_json": json.dumps(kpis["sales_by_month"]),
+        "revenue_labels_json": json.dumps(kpis["revenue_labels"]),
+        "revenue_data_json": json.dumps(kpis["revenue_data"]),
+        "kpi_cache": kpi_cache_stats(),
     }
     return render(request, "dashboard/admin_dashboard.html", context)
 
+@login_required
+@user_passes_test(lambda u: u.is_staff)
+def kpi_cache_stats_view(request):
+    return JsonResponse(kpi_cache_stats())
+
 @login_required
 @user_passes_test(lambda u: u.is_staff)
 def reports_view(request):
-    orders = Order.objects.all().order_by("-created_at")
-    total_sales = sum(sum(item.price * item.quantity for item in order.items.all()) for order in orders)
-    return render(request, "dashboard/reports.html", {"orders": orders, "total_sales": total_sales})
+    """Recent orders plus the report jobs; full listings are built by run_report_worker"""
+    orders = Order.objects.select_related("user").order_by("-created_at")[:20]
+    context = {
+        "orders": orders,
+        "total_sales": analytics.total_sales(),
+        "report_jobs": ReportJob.objects.select_related("requested_by")[:10],
+        "report_choices": ReportJob.REPORT_CHOICES,
+        "status_choices": Order.STATUS_CHOICES,
+    }
+    return render(request, "dashboard/reports.html", context)
+
+def _report_job_json(job):
+    return {
+        "id": job.id,
+        "report_type": job.report_type,
+        "status": job.status,
+        "rows_written": job.rows_written,
+        "error": job.error,
+        "created_at": job.created_at.isoformat(),
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "download_url": reverse("report_job_download", args=[job.id]) if job.status == "Completed" else None,
+    }
+
+@login_required
+@user_passes_test(lambda u: u.is_staff)
+def report_job_create(request):
+    if request.method != "POST":
+        return JsonResponse({'status': 'error', 'message': 'Invalid request method'}, status=400)
+    report_type = request.POST.get("report_type", "orders")
+    if report_type not in dict(ReportJob.REPORT_CHOICES):
+        return JsonResponse({'status': 'error', 'message': 'Unknown report type'}, status=400)
+    job = reports.enqueue_report(report_type, request.POST, user=request.user)
+    if request.headers.get("x-requested-with") == "XMLHttpRequest":
+        return JsonResponse(_report_job_json(job), status=202)
+    messages.success(request, f"Report #{job.id} queued. It will be ready to download shortly.")
+    return redirect("reports_view")
+
+@login_required
+@user_passes_test(lambda u: u.is_staff)
+def report_job_status(request, pk):
+    job = get_object_or_404(ReportJob, pk=pk)
+    return JsonResponse(_report_job_json(job))
+
+@login_required
+@user_passes_test(lambda u: u.is_staff)
+def report_job_download(request, pk):
+    job = get_object_or_404(ReportJob, pk=pk, status="Completed")
+    if not job.file:
+        raise Http404("Report file is missing")
+    return FileResponse(job.file.open("rb"), as_attachment=True, filename=os.path.basename(job.file.name))
 
 @login_required
 @user_passes_test(lambda u: u.is_staff)
@@ -184,7 +227,7 @@ def products_list(request):
     category = request.GET.get("category", "")
     stock = request.GET.get("stock", "")
     if search:
-        products = products.filter(name__icontains=search)
+        products = search_products(products, search).order_by("-search_rank", "-created_at")
     if category:
         products = products.filter(category__name=category)
     if stock == "inStock":
@@ -193,22 +236,35 @@ def products_list(request):
         products = products.filter(stock__gt=0, stock__lte=10)
     elif stock == "outOfStock":
         products = products.filter(stock=0)
-    in_stock = products.filter(stock__gt=10).count()
-    low_stock = products.filter(stock__gt=0, stock__lte=10).count()
-    out_of_stock = products.filter(stock=0).count()
-    paginator = Paginator(products, 5)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    summary = stock_summary(products)
+    page_obj = paginate_request(request, products, 5)
     context = {
         "page_obj": page_obj,
+        "filter_query": _filter_query(request),
         "categories": categories,
-        "in_stock": in_stock,
-        "low_stock": low_stock,
-        "out_of_stock": out_of_stock,
+        "total_products": summary["total"],
+        "in_stock": summary["in_stock"],
+        "low_stock": summary["low_stock"],
+        "out_of_stock": summary["out_of_stock"],
         "request": request,
     }
     return render(request, "dashboard/products.html", context)
 
+def _filter_query(request):
+    query_params = request.GET.copy()
+    query_params.pop("cursor", None)
+    return query_params.urlencode()
+
+def _product_form_context(form):
+    summary = stock_summary()
+    return {
+        "form": form,
+        "products_count": summary["total"],
+        "active_products_count": summary["active"],
+        "low_stock_count": summary["low_or_out_of_stock"],
+        "recent_products": Product.objects.only("name", "image", "created_at").order_by('-created_at')[:3],
+    }
+
 @login_required
 @user_passes_test(lambda u: u.is_staff)
 def product_create(request):
@@ -220,7 +276,7 @@ def product_create(request):
             return redirect("products_list")
     else:
         form = ProductForm()
-    return render(request, "dashboard/product_form.html", {"form": form})
+    return render(request, "dashboard/product_form.html", _product_form_context(form))
 
 @login_required
 @user_passes_test(lambda u: u.is_staff)
@@ -234,18 +290,7 @@ def product_update(request, pk):
             return redirect("products_list")
     else:
         form = ProductForm(instance=product)
-    products_count = Product.objects.count()
-    active_products_count = Product.objects.filter(is_active=True).count()
-    low_stock_count = Product.objects.filter(stock__lte=10).count()
-    recent_products = Product.objects.order_by('-created_at')[:5]
-    context = {
-        "form": form,
-        "products_count": products_count,
-        "active_products_count": active_products_count,
-        "low_stock_count": low_stock_count,
-        "recent_products": recent_products,
-    }
-    return render(request, "dashboard/product_form.html", context)
+    return render(request, "dashboard/product_form.html", _product_form_context(form))
 
 @login_required
 @user_passes_test(lambda u: u.is_staff)
@@ -258,14 +303,13 @@ def product_delete(request, pk):
 @login_required
 def orders_list(request):
     if request.user.is_staff:
-        orders = Order.objects.all().order_by("-created_at")
+        orders = Order.objects.select_related("user").order_by("-created_at")
     else:
-        orders = Order.objects.filter(user=request.user).order_by("-created_at")
-    paginator = Paginator(orders, 10)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+        orders = Order.objects.filter(user=request.user).select_related("user").order_by("-created_at")
+    page_obj = paginate_request(request, orders, 10, ordering=("-created_at", "-id"))
     context = {
         "orders": page_obj,
+        "filter_query": _filter_query(request),
         "total_orders": orders.count(),
         "completed": orders.filter(status="Completed").count(),
         "processing": orders.filter(status="Processing").count(),
@@ -294,7 +338,8 @@ def order_update(request, pk):
     if request.method == "POST":
         form = OrderForm(request.POST, instance=order)
         if form.is_valid():
-            form.save()
+            with track_order_sales(order):
+                form.save()
             messages.success(request, "Order updated successfully!")
             return redirect("orders_list")
     else:
@@ -306,7 +351,8 @@ def order_update(request, pk):
 def order_delete(request, pk):
     order = get_object_or_404(Order, pk=pk)
     if request.method == "POST":
-        order.delete()
+        with track_order_sales(order):
+            order.delete()
         messages.success(request, "Order deleted successfully!")
         return redirect("orders_list")
     return render(request, "dashboard/order_confirm_delete.html", {"order": order})
@@ -314,25 +360,22 @@ def order_delete(request, pk):
 @login_required
 @user_passes_test(lambda u: u.is_staff)
 def export_orders_csv(request):
-    response = HttpResponse(content_type="text/csv")
+    orders = exports.filter_orders(request.GET)
+    writer = csv.writer(exports.Echo())
+    rows = itertools.chain([exports.ORDER_CSV_HEADER], exports.order_csv_rows(orders))
+    response = StreamingHttpResponse(
+        (writer.writerow(row) for row in rows),
+        content_type="text/csv",
+    )
     response["Content-Disposition"] = 'attachment; filename="orders.csv"'
-    writer = csv.writer(response)
-    writer.writerow(["ID", "Customer", "Date", "Total", "Status"])
-    for order in Order.objects.all():
-        writer.writerow([
-            order.id,
-            order.user.username if order.user else "Guest",
-            order.created_at.strftime("%Y-%m-%d"),
-            sum(i.price * i.quantity for i in order.items.all()),
-            order.status,
-        ])
     return response
 
 @login_required
 def cart_page(request):
     cart, _ = Cart.objects.get_or_create(user=request.user)
-    items = cart.items.select_related("product")
-    return render(request, "dashboard/cart.html", {"cart": cart, "items": items})
+    items = list(cart.items.select_related("product"))
+    recommendations = recommendations_for({item.product_id for item in items}, limit=4)
+    return render(request, "dashboard/cart.html", {"cart": cart, "items": items, "recommendations": recommendations})
 
 @login_required
 def checkout_view(request):
@@ -348,13 +391,17 @@ def checkout_view(request):
         # Create order
         order = Order.objects.create(user=request.user, status="Pending")
         
-        for item in items:
-            OrderItem.objects.create(
+        OrderItem.objects.bulk_create([
+            OrderItem(
                 order=order,
                 product=item.product,
                 quantity=item.quantity,
                 price=item.product.price
             )
+            for item in items
+        ])
+        order.refresh_totals()
+        record_order_sales(order)
         
         # Clear cart
         cart.items.all().delete()
@@ -384,16 +431,18 @@ def payment_view(request, order_id):
         if payment_method == "card":
             if len(card_number.replace(" ", "")) >= 13 and expiry_date and len(cvv) == 3:
                 # Mark order as processing
-                order.status = "Processing"
-                order.save()
+                with track_order_sales(order):
+                    order.status = "Processing"
+                    order.save()
                 messages.success(request, "Payment successful! Your order is being processed.")
                 return redirect('order_success', order_id=order.id)
             else:
                 messages.error(request, "Invalid payment details. Please check your card information.")
         else:
             # Other payment methods (also fake)
-            order.status = "Processing"
-            order.save()
+            with track_order_sales(order):
+                order.status = "Processing"
+                order.save()
             messages.success(request, "Payment successful! Your order is being processed.")
             return redirect('order_success', order_id=order.id)
     
@@ -419,6 +468,36 @@ def clear_cart(request):
     messages.success(request, "Cart cleared successfully!")
     return redirect("cart_page")
 
+@never_cache
+def cart_badge(request):
+    """Cart item count for the navbar badge, fetched separately so pages stay cacheable"""
+    count = 0
+    if request.user.is_authenticated:
+        count = cart_item_count(request.user.pk)
+    return JsonResponse({"count": count})
+
+@login_required
+def cart_add(request):
+    """Add a product to the cart from a JSON POST (session-authenticated, unlike the cart API)"""
+    if request.method != "POST":
+        return JsonResponse({'status': 'error', 'message': 'Invalid request method'}, status=400)
+    try:
+        data = json.loads(request.body or "{}")
+        product_id = int(data.get("product"))
+        quantity = int(data.get("quantity", 1))
+    except (AttributeError, TypeError, ValueError):
+        return JsonResponse({'status': 'error', 'message': 'Invalid product or quantity'}, status=400)
+    if quantity < 1:
+        return JsonResponse({'status': 'error', 'message': 'Quantity must be at least 1'}, status=400)
+    cart, _ = Cart.objects.get_or_create(user=request.user)
+    try:
+        add_to_cart(cart, product_id, quantity)
+    except Product.DoesNotExist:
+        return JsonResponse({'status': 'error', 'message': 'Product not found'}, status=404)
+    except InsufficientStock:
+        return JsonResponse({'status': 'error', 'message': 'Not enough stock left for this product'}, status=400)
+    return JsonResponse({'status': 'success'})
+
 @login_required
 def remove_from_cart(request, item_id):
     item = get_object_or_404(CartItem, id=item_id, cart__user=request.user)
@@ -426,67 +505,57 @@ def remove_from_cart(request, item_id):
     messages.success(request, "Item removed from cart!")
     return redirect("cart_page")
 
+@cache_anonymous_page()
 def home_view(request):
     """Homepage view - accessible to everyone"""
-    categories = Category.objects.all()
-    featured_products = Product.objects.filter(stock__gt=0, is_active=True).order_by('-created_at')[:8]
+    catalog = get_catalog()
     context = {
-        'categories': categories,
-        'featured_products': featured_products,
+        'categories': catalog.categories,
+        'featured_products': catalog.newest(8),
     }
     return render(request, "dashboard/home.html", context)
 
+SHOP_ORDERINGS = {
+    "name": ("name", "id"),
+    "price-low": ("price", "id"),
+    "price-high": ("-price", "-id"),
+    "newest": ("-created_at", "-id"),
+    "popular": ("-views", "-id"),
+    "relevance": ("-search_rank", "-id"),
+}
+
+@cache_anonymous_page(params=("search", "category", "brand", "min_price", "max_price", "stock", "sort", "cursor"))
 def shop_view(request):
     """Shop view - accessible to everyone, but login required for purchases"""
-    products = Product.objects.filter(stock__gt=0, is_active=True)
-    categories = Category.objects.all()
-    search = request.GET.get("search", "")
-    selected_category = request.GET.get("category", "all")
-    min_price = request.GET.get("min_price", "")
-    max_price = request.GET.get("max_price", "")
-    stock_filter = request.GET.get("stock", "")
-    sort = request.GET.get("sort", "name")
+    filters = storefront_filters(request.GET)
+    search = filters["search"]
+    selected_category = filters["category"]
+    min_price = filters["min_price"] if filters["min_price"] is not None else ""
+    max_price = filters["max_price"] if filters["max_price"] is not None else ""
+    stock_filter = filters["stock"]
+    sort = request.GET.get("sort", "relevance" if search else "name")
+    catalog = get_catalog()
+
+    facets = get_facets(filters)["facets"]
+    category_counts = {facet["id"]: facet["count"] for facet in facets["category"]}
+    categories = []
+    for category in catalog.categories:
+        # Snapshot objects are shared between requests; annotate a copy.
+        category = copy.copy(category)
+        category.facet_count = category_counts.get(category.id, 0)
+        categories.append(category)
+    stock_counts = {f"{facet['value']}_stock": facet["count"] for facet in facets["stock"]}
     
+    if sort == "relevance" and not search:
+        sort = "name"
+    ordering = SHOP_ORDERINGS.get(sort, SHOP_ORDERINGS["name"])
     if search:
-        products = products.filter(name__icontains=search)
-    if selected_category != "all":
-        products = products.filter(category__name=selected_category)
-    if min_price:
-        try:
-            min_price = float(min_price)
-            products = products.filter(price__gte=min_price)
-        except ValueError:
-            min_price = 0
-    if max_price:
-        try:
-            max_price = float(max_price)
-            products = products.filter(price__lte=max_price)
-        except ValueError:
-            max_price = 1000
-    if stock_filter == "in":
-        products = products.filter(stock__gt=10)
-    elif stock_filter == "low":
-        products = products.filter(stock__gt=0, stock__lte=10)
-    
-    if sort == "price-low":
-        products = products.order_by("price")
-    elif sort == "price-high":
-        products = products.order_by("-price")
-    elif sort == "newest":
-        products = products.order_by("-created_at")
-    elif sort == "popular":
-        products = products.order_by("-views")
+        products = storefront_products(filters).select_related("category")
+        page_obj = paginate_request(request, products, 20, ordering=ordering)
     else:
-        products = products.order_by("name")
-    
-    paginator = Paginator(products, 20)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
-    
-    cart_items_count = 0
-    if request.user.is_authenticated:
-        cart, _ = Cart.objects.get_or_create(user=request.user)
-        cart_items_count = cart.items.count()
+        products = [product for product in catalog.products if matches_storefront_filters(product, filters)]
+        page_obj = paginate_request_list(request, products, Product, 20, ordering)
+    filter_query = _filter_query(request)
     
     # Handle adding to cart - require login
     if request.method == "POST":
@@ -496,18 +565,15 @@ def shop_view(request):
         
         product_id = request.POST.get("product_id")
         quantity = int(request.POST.get("quantity", 1))
-        if product_id:
+        if product_id and quantity < 1:
+            messages.error(request, "Quantity must be at least 1.")
+        elif product_id:
+            product = get_object_or_404(Product.objects.only("name"), id=product_id, stock__gt=0)
             cart, _ = Cart.objects.get_or_create(user=request.user)
-            product = get_object_or_404(Product, id=product_id, stock__gt=0)
-            if quantity <= product.stock:
-                cart_item, created = CartItem.objects.get_or_create(
-                    cart=cart, product=product, defaults={'quantity': quantity}
-                )
-                if not created:
-                    cart_item.quantity += quantity
-                    cart_item.save()
+            try:
+                add_to_cart(cart, product.pk, quantity)
                 messages.success(request, f"Added {quantity} × {product.name} to your cart!")
-            else:
+            except InsufficientStock:
                 messages.error(request, f"Insufficient stock for {product.name}")
         query_params = request.GET.urlencode()
         redirect_url = f"?{query_params}" if query_params else ""
@@ -517,11 +583,18 @@ def shop_view(request):
         "page_obj": page_obj,
         "categories": categories,
         "selected_category": selected_category,
+        "selected_brand": filters["brand"],
+        "brand_facets": facets["brand"],
+        "price_facets": [
+            dict(facet, min_price=low, max_price=high)
+            for facet, (_, _, low, high) in zip(facets["price"], PRICE_BANDS)
+        ],
+        "stock_counts": stock_counts,
+        "filter_query": filter_query,
         "min_price": min_price,
         "max_price": max_price,
         "stock_filter": stock_filter,
         "sort": sort,
         "search": search,
-        "cart_items_count": cart_items_count,
     }
     return render(request, "dashboard/shop.html", context)
\ No newline at end of file
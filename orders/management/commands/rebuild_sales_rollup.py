@@ -0,0 +1,27 @@
+"""
+Management command to rebuild the daily sales rollup from order items.
+
+Usage:
+    python manage.py rebuild_sales_rollup
+    python manage.py rebuild_sales_rollup --batch-size 5000
+"""
+
+from django.core.management.base import BaseCommand
+from orders.rollups import rebuild_sales_rollup
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the DailySalesRollup table from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rollup rows written per INSERT',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding daily sales rollup...')
+        rows = rebuild_sales_rollup(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'✓ Rebuilt sales rollup: {rows} rows'))
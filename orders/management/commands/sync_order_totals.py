@@ -0,0 +1,45 @@
+"""
+Management command to backfill or verify the stored Order totals.
+
+Usage:
+    python manage.py sync_order_totals
+    python manage.py sync_order_totals --verify
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from orders.totals import backfill_order_totals, mismatched_orders
+
+
+class Command(BaseCommand):
+    help = 'Recompute Order.total_amount and Order.item_count from order items'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Only report orders whose stored totals are wrong; exits non-zero if any are found',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Number of orders updated per statement',
+        )
+
+    def handle(self, *args, **options):
+        if options['verify']:
+            mismatched = mismatched_orders().order_by('pk')
+            count = 0
+            for order in mismatched.iterator():
+                count += 1
+                self.stdout.write(
+                    f'  ✗ Order #{order.pk}: stored {order.total_amount}/{order.item_count}, '
+                    f'expected {order.expected_amount}/{order.expected_count}'
+                )
+            if count:
+                raise CommandError(f'{count} order(s) have stale totals')
+            self.stdout.write(self.style.SUCCESS('✓ All order totals are correct'))
+            return
+
+        updated = backfill_order_totals(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'✓ Recomputed totals for {updated} orders'))
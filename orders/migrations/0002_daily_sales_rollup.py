@@ -0,0 +1,67 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, F, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollup(apps, schema_editor):
+    OrderItem = apps.get_model('orders', 'OrderItem')
+    DailySalesRollup = apps.get_model('orders', 'DailySalesRollup')
+    rows = (
+        OrderItem.objects.annotate(
+            day=TruncDate('order__created_at'),
+            category_ref=F('product__category_id'),
+            order_status=F('order__status'),
+        )
+        .values('day', 'category_ref', 'order_status')
+        .annotate(
+            revenue=Sum(F('price') * F('quantity'), output_field=DecimalField(max_digits=14, decimal_places=2)),
+            units=Sum('quantity'),
+            orders=Count('order_id', distinct=True),
+        )
+        .order_by()
+    )
+    DailySalesRollup.objects.bulk_create(
+        [
+            DailySalesRollup(
+                date=row['day'],
+                category_id=row['category_ref'],
+                status=row['order_status'],
+                revenue=row['revenue'] or 0,
+                units=row['units'] or 0,
+                order_count=row['orders'],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0001_initial'),
+        ('products', '0002_alter_product_options_product_created_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Processing', 'Processing'), ('Completed', 'Completed'), ('Cancelled', 'Cancelled')], max_length=20)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('units', models.IntegerField(default=0)),
+                ('order_count', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_rollups', to='products.category')),
+            ],
+            options={
+                'ordering': ['date'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'category', 'status'), name='unique_daily_sales_rollup')],
+            },
+        ),
+        migrations.RunPython(backfill_rollup, migrations.RunPython.noop),
+    ]
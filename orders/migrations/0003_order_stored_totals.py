@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:12
+
+from django.db import migrations, models
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_totals(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    OrderItem = apps.get_model('orders', 'OrderItem')
+    money = DecimalField(max_digits=12, decimal_places=2)
+    lines = OrderItem.objects.filter(order=OuterRef('pk')).order_by().values('order')
+    amount = lines.annotate(value=Sum(F('price') * F('quantity'), output_field=money)).values('value')
+    count = lines.annotate(value=Sum('quantity')).values('value')
+    Order.objects.update(
+        total_amount=Coalesce(Subquery(amount, output_field=money), Value(0), output_field=money),
+        item_count=Coalesce(Subquery(count), Value(0)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_daily_sales_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='total_amount',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
-from products.models import Product
+from products.models import Category, Product
 
 
 class Order(models.Model):
@@ -21,22 +22,40 @@ class Order(models.Model):
         choices=STATUS_CHOICES,
         default="Pending"
     )
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
+    total_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    item_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "created_at"]),
+            models.Index(fields=["status", "created_at"]),
+        ]
 
     def __str__(self):
         return f"Order #{self.id} - {self.user.username} - {self.status}"
 
+    def refresh_totals(self):
+        """Recompute the stored total_amount/item_count from this order's items"""
+        totals = self.items.aggregate(
+            amount=models.Sum(models.F("price") * models.F("quantity")),
+            count=models.Sum("quantity"),
+        )
+        self.total_amount = totals["amount"] or 0
+        self.item_count = totals["count"] or 0
+        Order.objects.filter(pk=self.pk).update(
+            total_amount=self.total_amount, item_count=self.item_count
+        )
+
     @property
     def total_price(self):
-        return sum(item.total_price for item in self.items.all())
+        return self.total_amount
 
     @property
     def total_items(self):
-        return sum(item.quantity for item in self.items.all())
+        return self.item_count
 
     @property
     def status_color(self):
@@ -46,9 +65,6 @@ class Order(models.Model):
             'Completed': 'success',
             'Cancelled': 'danger'
         }.get(self.status, 'secondary')
-    @property
-    def total_amount(self):
-        return sum(item.price * item.quantity for item in self.items.all())
 
 class OrderItem(models.Model):
     order = models.ForeignKey(
@@ -66,3 +82,82 @@ class OrderItem(models.Model):
     @property
     def total_price(self):
         return self.price * self.quantity
+
+
+class DailySalesRollup(models.Model):
+    """Per-day sales totals by category and order status, kept in step by orders.rollups"""
+    date = models.DateField()
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name="sales_rollups"
+    )
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    units = models.IntegerField(default=0)
+    order_count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "category", "status"],
+                name="unique_daily_sales_rollup",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.date} - {self.category_id} - {self.status}"
+
+
+class ProductPairCount(models.Model):
+    """Number of orders containing both products; each pair is stored in both directions"""
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="+")
+    other = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="+")
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "other"],
+                name="unique_product_pair_count",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} + {self.other_id}: {self.count}"
+
+
+class ProductRecommendation(models.Model):
+    """Top-K co-purchased products per product, rebuilt by orders.recommendations"""
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="recommendations")
+    recommended = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="recommended_with")
+    rank = models.PositiveSmallIntegerField()
+    score = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ["product", "rank"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "rank"],
+                name="unique_product_recommendation_rank",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} -> {self.recommended_id} (#{self.rank})"
+
+
+class RecommendationRun(models.Model):
+    """One build_recommendations run; the highest last_order_id is the incremental watermark"""
+    full = models.BooleanField(default=False)
+    last_order_id = models.PositiveBigIntegerField(default=0)
+    orders = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+
+    def __str__(self):
+        return f"Recommendation run #{self.id} (orders <= {self.last_order_id})"
@@ -0,0 +1,58 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from products.models import Product
+from .models import Order, OrderItem
+from .rollups import product_sales_keys, refresh_sales_buckets
+from .totals import computed_totals
+
+# The sales rollup files each order line under its product's current
+# category, so a product that moves takes its sales along. A product delete
+# cascades to its order lines, which takes them out of the rollup and out
+# of the stored order totals.
+
+
+@receiver(pre_save, sender=Product, dispatch_uid="sales_rollup_product_category")
+def remember_sales_category(sender, instance, using, update_fields=None, **kwargs):
+    instance._sales_category_id = None
+    if instance._state.adding or (update_fields is not None and not {"category", "category_id"} & set(update_fields)):
+        return
+    instance._sales_category_id = (
+        Product.objects.using(using).filter(pk=instance.pk).values_list("category_id", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Product, dispatch_uid="sales_rollup_product_moved")
+def move_product_sales(sender, instance, **kwargs):
+    previous = getattr(instance, "_sales_category_id", None)
+    if previous is None or previous == instance.category_id:
+        return
+    keys = product_sales_keys(instance.pk)
+    refresh_sales_buckets(keys | {(day, previous, status) for day, _, status in keys})
+
+
+@receiver(pre_delete, sender=Product, dispatch_uid="sales_rollup_product_delete_keys")
+def remember_product_sales(sender, instance, **kwargs):
+    instance._sales_keys = product_sales_keys(instance.pk)
+
+
+@receiver(post_delete, sender=Product, dispatch_uid="sales_rollup_product_delete")
+def remove_product_sales(sender, instance, **kwargs):
+    # Runs after the cascade removed the order lines; recomputing the buckets
+    # is idempotent, so products deleted together may share them.
+    refresh_sales_buckets(getattr(instance, "_sales_keys", ()))
+
+
+@receiver(pre_delete, sender=Product, dispatch_uid="order_totals_product_delete_orders")
+def remember_product_orders(sender, instance, **kwargs):
+    instance._order_ids = list(
+        OrderItem.objects.filter(product=instance).values_list("order_id", flat=True).distinct()
+    )
+
+
+@receiver(post_delete, sender=Product, dispatch_uid="order_totals_product_delete")
+def refresh_product_order_totals(sender, instance, **kwargs):
+    # The cascade removed the product's lines; stored totals follow.
+    order_ids = getattr(instance, "_order_ids", ())
+    if order_ids:
+        Order.objects.filter(pk__in=order_ids).update(**computed_totals())
@@ -0,0 +1,152 @@
+"""
+"Frequently bought together" recommendations.
+
+ProductPairCount is a sparse, symmetric product x product matrix holding,
+for every pair of distinct products, the number of orders that contain
+both. build_recommendations() reads order lines in order-id batches,
+counts each batch's pairs in memory, adds them to the matrix with one
+upsert per batch, and rewrites the top-K neighbours of every product the
+batch touched into ProductRecommendation, which is the only table the
+request path reads. The highest order id processed is kept on
+RecommendationRun, so an incremental run only reads orders placed since
+the previous one. A run stops at the newest order that is at least
+PRODUCT_RECOMMENDATIONS_LAG_MINUTES old: ids are handed out before a
+checkout commits, so a recent order with a lower id than one already
+visible may still be in flight, and passing it would skip it for good.
+Cancelled orders are skipped when they are read; an
+order cancelled after it was counted stays counted until a full rebuild.
+"""
+
+import itertools
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Max, Sum, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from products.models import Product
+from .models import Order, OrderItem, ProductPairCount, ProductRecommendation, RecommendationRun
+
+
+def top_k():
+    return getattr(settings, "PRODUCT_RECOMMENDATIONS_TOP_K", 10)
+
+
+def watermark():
+    """Highest order id already counted"""
+    return RecommendationRun.objects.aggregate(last=Max("last_order_id"))["last"] or 0
+
+
+def settled_watermark():
+    """Id of the newest order old enough that every lower id has committed"""
+    lag = timedelta(minutes=getattr(settings, "PRODUCT_RECOMMENDATIONS_LAG_MINUTES", 5))
+    return (
+        Order.objects.filter(created_at__lte=timezone.now() - lag)
+        .order_by("-pk").values_list("pk", flat=True).first()
+    ) or 0
+
+
+def count_pairs(lines):
+    """Count product pairs over (order_id, product_id) rows sorted by order_id"""
+    pairs = Counter()
+    for _, basket in itertools.groupby(lines, key=lambda line: line[0]):
+        products = sorted({product_id for _, product_id in basket})
+        pairs.update(itertools.combinations(products, 2))
+    return pairs
+
+
+def add_pair_counts(pairs):
+    """Add `pairs` ({(a, b): n} with a < b) to ProductPairCount in both directions"""
+    if not pairs:
+        return
+    table = connection.ops.quote_name(ProductPairCount._meta.db_table)
+    rows = [(a, b, n) for (a, b), n in pairs.items()] + [(b, a, n) for (a, b), n in pairs.items()]
+    with connection.cursor() as cursor:
+        # An increment, which bulk_create(update_conflicts=True) cannot express.
+        cursor.executemany(
+            f"INSERT INTO {table} (product_id, other_id, count) VALUES (%s, %s, %s) "
+            f"ON CONFLICT (product_id, other_id) DO UPDATE SET count = {table}.count + excluded.count",
+            rows,
+        )
+
+
+def refresh_top_k(product_ids, k=None, chunk_size=500):
+    """Rewrite the ProductRecommendation rows of `product_ids` from the pair counts"""
+    k = k or top_k()
+    product_ids = sorted(product_ids)
+    for start in range(0, len(product_ids), chunk_size):
+        chunk = product_ids[start:start + chunk_size]
+        neighbours = (
+            ProductPairCount.objects.filter(product_id__in=chunk)
+            .annotate(position=Window(
+                RowNumber(),
+                partition_by=[F("product_id")],
+                order_by=[F("count").desc(), F("other_id").asc()],
+            ))
+            .filter(position__lte=k)
+            .values_list("product_id", "other_id", "count", "position")
+        )
+        ProductRecommendation.objects.filter(product_id__in=chunk).delete()
+        ProductRecommendation.objects.bulk_create([
+            ProductRecommendation(product_id=product_id, recommended_id=other_id, score=count, rank=position)
+            for product_id, other_id, count, position in neighbours
+        ])
+
+
+def clear_recommendations():
+    ProductRecommendation.objects.all().delete()
+    ProductPairCount.objects.all().delete()
+    RecommendationRun.objects.all().delete()
+
+
+def build_recommendations(full=False, batch_size=5000, k=None, on_batch=None):
+    """Count the orders placed since the last run (all orders if `full`); returns the run"""
+    with transaction.atomic():
+        if full:
+            clear_recommendations()
+        run = RecommendationRun.objects.create(full=full, last_order_id=watermark())
+    # Recent orders, and those created while the run is going, are left for the next one.
+    last_order_id = settled_watermark()
+    while run.last_order_id < last_order_id:
+        boundary = list(
+            Order.objects.filter(pk__gt=run.last_order_id, pk__lte=last_order_id)
+            .order_by("pk").values_list("pk", flat=True)[batch_size - 1:batch_size]
+        )
+        batch_end = boundary[0] if boundary else last_order_id
+        lines = list(
+            OrderItem.objects.filter(order_id__gt=run.last_order_id, order_id__lte=batch_end)
+            .exclude(order__status="Cancelled")
+            .order_by("order_id")
+            .values_list("order_id", "product_id")
+        )
+        pairs = count_pairs(lines)
+        with transaction.atomic():
+            add_pair_counts(pairs)
+            refresh_top_k({product_id for pair in pairs for product_id in pair}, k)
+            run.orders += len({order_id for order_id, _ in lines})
+            run.last_order_id = batch_end
+            run.save(update_fields=["orders", "last_order_id"])
+        if on_batch:
+            on_batch(run, len(pairs))
+    run.finished_at = timezone.now()
+    run.save(update_fields=["finished_at"])
+    return run
+
+
+def recommendations_for(product_ids, limit=None):
+    """Products most often bought with any of `product_ids`, best first, each with a `score`"""
+    product_ids = list(product_ids)
+    if not product_ids:
+        return []
+    return list(
+        Product.objects.filter(
+            recommended_with__product_id__in=product_ids, is_active=True, stock__gt=0
+        )
+        .exclude(pk__in=product_ids)
+        .annotate(score=Sum("recommended_with__score"))
+        .select_related("category")
+        .order_by("-score", "pk")[:limit or top_k()]
+    )
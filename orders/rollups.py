@@ -0,0 +1,158 @@
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, F, Sum
+from django.db.models.functions import TruncDate
+
+from .models import DailySalesRollup, OrderItem
+from .signals import sales_rollup_changed
+
+LINE_TOTAL = F("price") * F("quantity")
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+
+
+def sales_rows(items):
+    """Group order lines into (date, category, status) buckets"""
+    return (
+        items.annotate(
+            day=TruncDate("order__created_at"),
+            category_ref=F("product__category_id"),
+            order_status=F("order__status"),
+        )
+        .values("day", "category_ref", "order_status")
+        .annotate(
+            revenue=Sum(LINE_TOTAL, output_field=MONEY),
+            units=Sum("quantity"),
+            orders=Count("order_id", distinct=True),
+        )
+        .order_by()
+    )
+
+
+def order_contributions(order_ids):
+    rows = sales_rows(OrderItem.objects.filter(order_id__in=order_ids))
+    return {
+        (row["day"], row["category_ref"], row["order_status"]): (
+            row["revenue"] or Decimal("0"), row["units"] or 0, row["orders"]
+        )
+        for row in rows
+    }
+
+
+def _apply_delta(key, revenue, units, orders):
+    day, category_id, status = key
+    lookup = {"date": day, "category_id": category_id, "status": status}
+    changes = {
+        "revenue": F("revenue") + revenue,
+        "units": F("units") + units,
+        "order_count": F("order_count") + orders,
+    }
+    if DailySalesRollup.objects.filter(**lookup).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            DailySalesRollup.objects.create(
+                revenue=revenue, units=units, order_count=orders, **lookup
+            )
+    except IntegrityError:
+        # Another writer created the bucket first; add to it instead.
+        DailySalesRollup.objects.filter(**lookup).update(**changes)
+
+
+def apply_contributions(before, after):
+    """Move the rollup from the `before` snapshot to the `after` snapshot"""
+    zero = (Decimal("0"), 0, 0)
+    changed = False
+    for key in set(before) | set(after):
+        old, new = before.get(key, zero), after.get(key, zero)
+        delta = tuple(n - o for n, o in zip(new, old))
+        if any(delta):
+            _apply_delta(key, *delta)
+            changed = True
+    if before:
+        DailySalesRollup.objects.filter(
+            date__in={key[0] for key in before},
+            revenue=0, units=0, order_count=0,
+        ).delete()
+    if changed:
+        sales_rollup_changed.send(sender=DailySalesRollup)
+
+
+def product_sales_keys(product_id):
+    """The (date, category, status) buckets the lines of `product_id` count towards"""
+    return {
+        (row["day"], row["category_ref"], row["order_status"])
+        for row in sales_rows(OrderItem.objects.filter(product_id=product_id))
+    }
+
+
+def refresh_sales_buckets(keys):
+    """Recompute the rollup rows for `keys` from OrderItem, whatever they held before"""
+    keys = set(keys)
+    if not keys:
+        return
+    rows = sales_rows(OrderItem.objects.filter(
+        order__created_at__date__in={day for day, _, _ in keys},
+        product__category_id__in={category_id for _, category_id, _ in keys},
+        order__status__in={status for _, _, status in keys},
+    ))
+    fresh = {
+        (row["day"], row["category_ref"], row["order_status"]): row
+        for row in rows
+    }
+    with transaction.atomic():
+        for key in keys:
+            day, category_id, status = key
+            lookup = {"date": day, "category_id": category_id, "status": status}
+            row = fresh.get(key)
+            if row is None:
+                DailySalesRollup.objects.filter(**lookup).delete()
+            else:
+                DailySalesRollup.objects.update_or_create(**lookup, defaults={
+                    "revenue": row["revenue"] or 0,
+                    "units": row["units"] or 0,
+                    "order_count": row["orders"],
+                })
+    sales_rollup_changed.send(sender=DailySalesRollup)
+
+
+@contextmanager
+def track_order_sales(*orders):
+    """Wrap a change to existing orders so the rollup follows it"""
+    order_ids = [order.pk for order in orders]
+    with transaction.atomic():
+        before = order_contributions(order_ids)
+        yield
+        apply_contributions(before, order_contributions(order_ids))
+
+
+def record_order_sales(order):
+    """Add a newly created order (with its items) to the rollup"""
+    with transaction.atomic():
+        apply_contributions({}, order_contributions([order.pk]))
+
+
+def rebuild_sales_rollup(batch_size=1000):
+    """Recompute the whole rollup from OrderItem; returns the number of rows"""
+    created = 0
+    with transaction.atomic():
+        DailySalesRollup.objects.all().delete()
+        batch = []
+        for row in sales_rows(OrderItem.objects.all()).iterator(chunk_size=batch_size):
+            batch.append(DailySalesRollup(
+                date=row["day"],
+                category_id=row["category_ref"],
+                status=row["order_status"],
+                revenue=row["revenue"] or 0,
+                units=row["units"] or 0,
+                order_count=row["orders"],
+            ))
+            if len(batch) >= batch_size:
+                DailySalesRollup.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        DailySalesRollup.objects.bulk_create(batch)
+        created += len(batch)
+    sales_rollup_changed.send(sender=DailySalesRollup)
+    return created
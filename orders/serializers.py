@@ -1,16 +1,24 @@
+from collections import defaultdict
 from rest_framework import serializers
 from decimal import Decimal
 from .models import Order, OrderItem
+from .rollups import record_order_sales, track_order_sales
 from carts.models import Cart, CartItem
+from products.fastpath import FastListSerializer
+from products.fieldsets import ExpandableFieldsMixin
 from products.serializers import ProductSerializer
-class OrderItemSerializer(serializers.ModelSerializer):
+class OrderItemSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {"product": (ProductSerializer, {})}
+
     class Meta:
         model = OrderItem
         fields = ['id', 'product', 'quantity', 'price']
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     items = OrderItemSerializer(many=True)
     total_price = serializers.SerializerMethodField()
+    expandable_fields = {"items": (OrderItemSerializer, {"many": True})}
+    field_sources = {"total_price": ("total_amount",)}
 
     class Meta:
         model = Order
@@ -18,28 +26,63 @@ class OrderSerializer(serializers.ModelSerializer):
         read_only_fields = ['user']
 
     def get_total_price(self, obj):
-        total = sum(item.price * item.quantity for item in obj.items.all())
-        return Decimal(total).quantize(Decimal("0.01"))
+        return Decimal(obj.total_amount).quantize(Decimal("0.01"))
 
     def create(self, validated_data):
         items_data = validated_data.pop('items', [])
         user = self.context['request'].user
         order = Order.objects.create(user=user, **validated_data)
-        for item_data in items_data:
-            OrderItem.objects.create(order=order, **item_data)
+        OrderItem.objects.bulk_create(
+            [OrderItem(order=order, **item_data) for item_data in items_data]
+        )
+        order.refresh_totals()
+        record_order_sales(order)
         return order
 
     def update(self, instance, validated_data):
         items_data = validated_data.pop('items', None)
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-
-        if items_data is not None:
-            instance.items.all().delete()
-            for item_data in items_data:
-                OrderItem.objects.create(order=instance, **item_data)
+        with track_order_sales(instance):
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save()
+
+            if items_data is not None:
+                instance.items.all().delete()
+                OrderItem.objects.bulk_create(
+                    [OrderItem(order=instance, **item_data) for item_data in items_data]
+                )
+                instance.refresh_totals()
         return instance
+
+
+class OrderItemListSerializer(FastListSerializer):
+    serializer_class = OrderItemSerializer
+
+
+class OrderListSerializer(FastListSerializer):
+    """OrderSerializer output for list pages, with every page's items read in one query"""
+    serializer_class = OrderSerializer
+    computed_fields = {"items": ("id",), "total_price": ("total_amount",)}
+
+    def prepare(self, rows):
+        if "items" not in self.field_names:
+            return
+        items = OrderItemListSerializer(self.context)
+        lines = list(
+            OrderItem.objects.filter(order_id__in=[row["id"] for row in rows])
+            .order_by("pk")
+            .values("order_id", *items.columns())
+        )
+        self.items = defaultdict(list)
+        for line, data in zip(lines, items.serialize(lines)):
+            self.items[line["order_id"]].append(data)
+
+    def get_items(self, row):
+        return self.items.get(row["id"], [])
+
+    def get_total_price(self, row):
+        return Decimal(row["total_amount"]).quantize(Decimal("0.01"))
+
 class CartItemSerializer(serializers.ModelSerializer):
     product = ProductSerializer(read_only=True)
     class Meta:
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent after orders.rollups changes DailySalesRollup rows; the writes use
+# QuerySet.update() so no model signals fire for them.
+sales_rollup_changed = Signal()
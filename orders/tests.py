@@ -1,3 +1,61 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
 from django.test import TestCase
 
-# Create your tests here.
+from products.bulk import bulk_delete_products
+from products.models import Category, Product
+from .models import DailySalesRollup, Order, OrderItem
+from .rollups import record_order_sales, sales_rows, track_order_sales
+
+
+class SalesRollupTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user("buyer", password="pw")
+        self.old = Category.objects.create(name="Old")
+        self.new = Category.objects.create(name="New")
+        self.moved = Product.objects.create(name="Moved", price=Decimal("199.99"), stock=10, category=self.old)
+        self.stays = Product.objects.create(name="Stays", price=Decimal("5.00"), stock=10, category=self.old)
+        self.orders = []
+        for status in ("Completed", "Completed", "Pending"):
+            order = Order.objects.create(user=user, status=status)
+            OrderItem.objects.create(order=order, product=self.moved, quantity=1, price=Decimal("199.99"))
+            OrderItem.objects.create(order=order, product=self.stays, quantity=2, price=Decimal("5.00"))
+            record_order_sales(order)
+            self.orders.append(order)
+
+    def assertMatchesRebuild(self):
+        expected = {
+            (row["day"], row["category_ref"], row["order_status"]): (row["revenue"], row["units"], row["orders"])
+            for row in sales_rows(OrderItem.objects.all())
+        }
+        stored = {
+            (row.date, row.category_id, row.status): (row.revenue, row.units, row.order_count)
+            for row in DailySalesRollup.objects.all()
+        }
+        self.assertEqual(stored, expected)
+
+    def test_category_change_moves_sales(self):
+        self.moved.category = self.new
+        self.moved.save()
+        self.assertMatchesRebuild()
+
+        # Deleting an old order now subtracts from the product's new category.
+        with track_order_sales(self.orders[0]):
+            self.orders[0].items.all().delete()
+        self.orders[0].delete()
+        self.assertMatchesRebuild()
+
+    def test_product_delete_refreshes_order_totals(self):
+        bulk_delete_products([{"id": self.moved.pk}])
+
+        for order in Order.objects.all():
+            self.assertEqual((order.total_amount, order.item_count), (Decimal("10.00"), 2))
+
+    def test_product_delete_removes_its_sales(self):
+        self.moved.delete()
+        self.assertMatchesRebuild()
+
+        Product.objects.filter(pk=self.stays.pk).delete()
+        self.assertMatchesRebuild()
+        self.assertFalse(DailySalesRollup.objects.exists())
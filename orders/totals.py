@@ -0,0 +1,49 @@
+from decimal import Decimal
+
+from django.db.models import DecimalField, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Abs, Coalesce
+
+from .models import Order, OrderItem
+
+MONEY = DecimalField(max_digits=12, decimal_places=2)
+
+
+def computed_totals():
+    """Correlated subqueries giving each order's amount and unit count from its items"""
+    lines = OrderItem.objects.filter(order=OuterRef("pk")).order_by().values("order")
+    amount = lines.annotate(value=Sum(F("price") * F("quantity"), output_field=MONEY)).values("value")
+    count = lines.annotate(value=Sum("quantity")).values("value")
+    return {
+        "total_amount": Coalesce(Subquery(amount, output_field=MONEY), Value(0), output_field=MONEY),
+        "item_count": Coalesce(Subquery(count), Value(0)),
+    }
+
+
+def backfill_order_totals(orders=None, batch_size=10000):
+    """Rewrite stored totals from order items, one primary-key range per UPDATE"""
+    orders = Order.objects.all() if orders is None else orders
+    updated = 0
+    last_pk = 0
+    while True:
+        pks = list(
+            orders.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[:batch_size]
+        )
+        if not pks:
+            return updated
+        updated += Order.objects.filter(pk__gte=pks[0], pk__lte=pks[-1]).update(**computed_totals())
+        last_pk = pks[-1]
+
+
+def mismatched_orders(orders=None):
+    """Orders whose stored totals disagree with their items"""
+    orders = Order.objects.all() if orders is None else orders
+    expressions = computed_totals()
+    return orders.annotate(
+        expected_amount=expressions["total_amount"],
+        expected_count=expressions["item_count"],
+    ).alias(
+        amount_drift=Abs(F("total_amount") - F("expected_amount")),
+    ).filter(
+        # SQLite evaluates the expected amount in floating point; compare to the cent.
+        Q(amount_drift__gte=Decimal("0.005")) | ~Q(item_count=F("expected_count"))
+    )
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import OrderViewSet, OrderItemViewSet, CheckoutView
+from .views import OrderViewSet, OrderItemViewSet, CheckoutView, RecommendationsView
 
 router = DefaultRouter()
 router.register(r'orders', OrderViewSet, basename="order")
@@ -8,5 +8,6 @@ router.register(r'order-items', OrderItemViewSet, basename="orderitem")
 
 urlpatterns = [
     path('checkout/', CheckoutView.as_view(), name='checkout'),
+    path('recommendations/', RecommendationsView.as_view(), name='recommendations'),
     path('', include(router.urls)),
 ]
@@ -1,21 +1,58 @@
 from rest_framework import viewsets, status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from .models import Order, OrderItem
-from .serializers import OrderSerializer, OrderItemSerializer
+from .serializers import OrderListSerializer, OrderSerializer, OrderItemSerializer
+from .recommendations import recommendations_for
+from .rollups import record_order_sales, track_order_sales
 from carts.models import Cart
+from products.fastpath import FastListMixin
+from products.fieldsets import SparseFieldsetMixin
+from products.pagination import KeysetPagination
+from products.serializers import ProductSerializer
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(FastListMixin, viewsets.ModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
+    fast_list_serializer_class = OrderListSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    ordering_fields = ['created_at', 'total_amount']
 
-class OrderItemViewSet(viewsets.ModelViewSet):
+    def perform_destroy(self, instance):
+        with track_order_sales(instance):
+            instance.delete()
+
+class OrderItemViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = OrderItem.objects.all()
     serializer_class = OrderItemSerializer
     permission_classes = [IsAuthenticated]
 
+    def perform_create(self, serializer):
+        order = serializer.validated_data.get("order")
+        if order is None:
+            serializer.save()
+            return
+        with track_order_sales(order):
+            serializer.save()
+            order.refresh_totals()
+
+    def perform_update(self, serializer):
+        orders = {serializer.instance.order}
+        if "order" in serializer.validated_data:
+            orders.add(serializer.validated_data["order"])
+        with track_order_sales(*orders):
+            serializer.save()
+            for order in orders:
+                order.refresh_totals()
+
+    def perform_destroy(self, instance):
+        order = instance.order
+        with track_order_sales(order):
+            instance.delete()
+            order.refresh_totals()
+
 class CheckoutView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -31,14 +68,42 @@ class CheckoutView(APIView):
 
         order = Order.objects.create(user=user, status="Pending")
 
-        for item in cart.items.all():
-            OrderItem.objects.create(
+        OrderItem.objects.bulk_create([
+            OrderItem(
                 order=order,
                 product=item.product,
                 quantity=item.quantity,
                 price=item.product.price
             )
+            for item in cart.items.select_related("product")
+        ])
 
+        order.refresh_totals()
+        record_order_sales(order)
         cart.items.all().delete()
         serializer = OrderSerializer(order)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+class RecommendationsView(APIView):
+    """Products frequently bought together with `?product=` (repeat it for a whole cart)"""
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        try:
+            product_ids = [int(value) for value in request.query_params.getlist("product")]
+            limit = min(int(request.query_params.get("limit", 10)), 50)
+        except ValueError:
+            return Response({"error": "product and limit must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+        if not product_ids:
+            return Response({"error": "At least one product is required"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(product_ids) > 50:
+            return Response({"error": "At most 50 products are allowed"}, status=status.HTTP_400_BAD_REQUEST)
+        products = recommendations_for(product_ids, limit=max(limit, 1))
+        context = {"request": request}
+        return Response({
+            "products": product_ids,
+            "results": [
+                dict(ProductSerializer(product, context=context).data, score=product.score)
+                for product in products
+            ],
+        })
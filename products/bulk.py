@@ -0,0 +1,141 @@
+"""
+Batch create/update/delete for ProductViewSet.bulk.
+
+Every item is validated with BulkProductSerializer (categories and target
+products are fetched once for the whole batch); the valid items are then
+written together in one transaction with bulk_create / bulk_update /
+a single DELETE. Invalid items are reported per index and skipped.
+Bulk writes bypass post_save, so products_bulk_changed is sent for the
+search index, catalog snapshot and dashboard caches.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Category, Product
+from .serializers import BulkProductSerializer
+from .signals import products_bulk_changed
+
+
+class BulkPayloadError(ValueError):
+    pass
+
+
+def max_items():
+    return getattr(settings, "PRODUCT_BULK_MAX_ITEMS", 500)
+
+
+def check_payload(items):
+    if not isinstance(items, list) or not items:
+        raise BulkPayloadError("Expected a non-empty list of items")
+    if len(items) > max_items():
+        raise BulkPayloadError(f"At most {max_items()} items per request")
+
+
+def _categories(items):
+    ids = set()
+    for item in items:
+        if isinstance(item, dict):
+            try:
+                ids.add(int(item.get("category")))
+            except (TypeError, ValueError):
+                pass
+    return Category.objects.in_bulk(ids)
+
+
+def _item_id(item):
+    value = item.get("id") if isinstance(item, dict) else item
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _error(index, errors, product_id=None):
+    return {"index": index, "id": product_id, "status": "error", "errors": errors}
+
+
+def bulk_create_products(items, context):
+    check_payload(items)
+    context = dict(context, categories=_categories(items))
+    results, products = [], []
+    for index, item in enumerate(items):
+        serializer = BulkProductSerializer(data=item, context=context)
+        if serializer.is_valid():
+            products.append((index, Product(**serializer.validated_data)))
+        else:
+            results.append(_error(index, serializer.errors))
+    with transaction.atomic():
+        Product.objects.bulk_create([product for _, product in products])
+        product_ids = [product.pk for _, product in products]
+        if product_ids:
+            products_bulk_changed.send(sender=Product, product_ids=product_ids)
+    results += [{"index": index, "id": product.pk, "status": "created"} for index, product in products]
+    return sorted(results, key=lambda result: result["index"])
+
+
+def bulk_update_products(items, context):
+    check_payload(items)
+    context = dict(context, categories=_categories(items))
+    ids = [_item_id(item) for item in items]
+    instances = Product.objects.in_bulk([pk for pk in ids if pk is not None])
+    results, products, fields, seen, moved_from = [], [], set(), set(), set()
+    for index, (item, pk) in enumerate(zip(items, ids)):
+        if not isinstance(item, dict):
+            results.append(_error(index, {"non_field_errors": ["Expected an object."]}))
+            continue
+        if pk is None:
+            results.append(_error(index, {"id": ["This field is required."]}))
+            continue
+        if pk in seen:
+            results.append(_error(index, {"id": ["Duplicate id in this request."]}, pk))
+            continue
+        seen.add(pk)
+        if pk not in instances:
+            results.append(_error(index, {"id": ["Not found."]}, pk))
+            continue
+        data = {key: value for key, value in item.items() if key != "id"}
+        serializer = BulkProductSerializer(instances[pk], data=data, partial=True, context=context)
+        if not serializer.is_valid():
+            results.append(_error(index, serializer.errors, pk))
+            continue
+        if "category" in serializer.validated_data:
+            moved_from.add(instances[pk].category_id)
+        for field, value in serializer.validated_data.items():
+            setattr(instances[pk], field, value)
+        fields.update(serializer.validated_data)
+        products.append((index, instances[pk]))
+    now = timezone.now()
+    for _, product in products:
+        # bulk_update() does not run auto_now.
+        product.updated_at = now
+    with transaction.atomic():
+        if fields:
+            Product.objects.bulk_update(
+                [product for _, product in products], sorted(fields | {"updated_at"}), batch_size=500
+            )
+        product_ids = [product.pk for _, product in products]
+        if product_ids:
+            products_bulk_changed.send(sender=Product, product_ids=product_ids, category_ids=moved_from)
+    results += [{"index": index, "id": product.pk, "status": "updated"} for index, product in products]
+    return sorted(results, key=lambda result: result["index"])
+
+
+def bulk_delete_products(items):
+    check_payload(items)
+    ids = [_item_id(item) for item in items]
+    existing = set(Product.objects.filter(pk__in=[pk for pk in ids if pk is not None]).values_list("pk", flat=True))
+    with transaction.atomic():
+        # delete() sends pre/post_delete per product, which update the search index, catalog
+        # version, category stats, and the totals and sales rollup of orders losing lines.
+        Product.objects.filter(pk__in=existing).delete()
+    results = []
+    for index, pk in enumerate(ids):
+        if pk is None:
+            results.append(_error(index, {"id": ["This field is required."]}))
+        elif pk not in existing:
+            results.append(_error(index, {"id": ["Not found."]}, pk))
+        else:
+            results.append({"index": index, "id": pk, "status": "deleted"})
+    return results
@@ -0,0 +1,119 @@
+"""
+Denormalised storefront stats on Category.
+
+active_product_count, min_price and max_price describe the products a
+shopper can buy (active and in stock). A single product save or delete
+adjusts them in place with one UPDATE per touched category
+(apply_product_change): the count moves by one when the product enters or
+leaves the set, and a price range is only re-aggregated, inside the same
+UPDATE, when the product that held its minimum or maximum leaves or moves
+inwards. Saves that leave the product where it was in the set (most stock
+changes) write nothing. Bulk writes, which bypass the per-instance signals,
+recompute the touched categories with refresh_category_stats(), and
+reconcile_category_stats recomputes every category in case something wrote
+around both.
+"""
+
+from django.db.models import Case, Count, F, Max, Min, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Now
+
+from .models import Category, Product
+from .snapshot import bump_catalog_version
+
+EMPTY = (0, None, None)
+
+
+def storefront_state(category_id, price, is_active, stock):
+    """(category_id, price) for a product shoppers can buy, else None"""
+    if not is_active or stock is None or stock <= 0:
+        return None
+    return category_id, Product._meta.get_field("price").to_python(price)
+
+
+def _recomputed(aggregate):
+    active = Product.objects.filter(category=OuterRef("pk"), is_active=True, stock__gt=0).order_by().values("category")
+    return Subquery(active.annotate(value=aggregate("price")).values("value"))
+
+
+def _entered(price):
+    return {
+        "active_product_count": F("active_product_count") + 1,
+        "min_price": Case(When(Q(min_price__isnull=True) | Q(min_price__gt=price), then=Value(price)), default=F("min_price")),
+        "max_price": Case(When(Q(max_price__isnull=True) | Q(max_price__lt=price), then=Value(price)), default=F("max_price")),
+    }
+
+
+def _left(price):
+    return {
+        # Never below zero, should the stored count have drifted.
+        "active_product_count": Case(When(active_product_count__gt=0, then=F("active_product_count") - 1), default=Value(0)),
+        "min_price": Case(When(min_price=price, then=_recomputed(Min)), default=F("min_price")),
+        "max_price": Case(When(max_price=price, then=_recomputed(Max)), default=F("max_price")),
+    }
+
+
+def _repriced(old, new):
+    return {
+        "min_price": Case(
+            When(min_price__gt=new, then=Value(new)), When(min_price=old, then=_recomputed(Min)), default=F("min_price")
+        ),
+        "max_price": Case(
+            When(max_price__lt=new, then=Value(new)), When(max_price=old, then=_recomputed(Max)), default=F("max_price")
+        ),
+    }
+
+
+def apply_product_change(before, after):
+    """
+    Adjust the stats for one product whose storefront_state() went from
+    `before` to `after`, after the product row itself has been written.
+    Returns the ids of the categories that were updated.
+    """
+    if before == after:
+        return set()
+    updates = []
+    if before is not None and (after is None or after[0] != before[0]):
+        updates.append((before[0], _left(before[1])))
+    if after is not None and (before is None or before[0] != after[0]):
+        updates.append((after[0], _entered(after[1])))
+    if before is not None and after is not None and before[0] == after[0]:
+        updates.append((after[0], _repriced(before[1], after[1])))
+    for category_id, values in updates:
+        Category.objects.filter(pk=category_id).update(updated_at=Now(), **values)
+    return {category_id for category_id, _ in updates}
+
+
+def category_stats(category_ids=None):
+    """{category_id: (active_product_count, min_price, max_price)} from the products table"""
+    products = Product.objects.filter(is_active=True, stock__gt=0)
+    if category_ids is not None:
+        products = products.filter(category_id__in=category_ids)
+    rows = (
+        products.order_by()
+        .values("category_id")
+        .annotate(count=Count("pk"), low=Min("price"), high=Max("price"))
+    )
+    return {row["category_id"]: (row["count"], row["low"], row["high"]) for row in rows}
+
+
+def refresh_category_stats(category_ids=None):
+    """Recompute the stats of `category_ids` (all categories if None); returns the number corrected"""
+    if category_ids is not None:
+        category_ids = {pk for pk in category_ids if pk is not None}
+        if not category_ids:
+            return 0
+    stats = category_stats(category_ids)
+    if category_ids is None:
+        category_ids = Category.objects.values_list("pk", flat=True)
+    changed = 0
+    for category_id in category_ids:
+        count, low, high = stats.get(category_id, EMPTY)
+        changed += (
+            Category.objects.filter(pk=category_id)
+            .exclude(active_product_count=count, min_price=low, max_price=high)
+            .update(active_product_count=count, min_price=low, max_price=high, updated_at=Now())
+        )
+    if changed:
+        # update() sends no post_save; the catalog snapshot carries these fields.
+        bump_catalog_version()
+    return changed
@@ -0,0 +1,120 @@
+"""
+Conditional GET for catalog endpoints.
+
+The validators come from one aggregate query: max(updated_at) and the row
+count of the filtered queryset for list views, the row's updated_at for
+detail views. Relations embedded with `?expand=` add their own
+max(updated_at), so renaming a category changes the ETag of products
+rendered with it; an expansion whose model has no updated_at turns
+conditional handling off for that request. The validators are checked
+against If-None-Match / If-Modified-Since before anything is serialized,
+and a match returns 304 with no body.
+"""
+
+import hashlib
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """ETag and Last-Modified for ModelViewSet list/retrieve; models need an `updated_at` field"""
+
+    def _etag(self, request, *parts):
+        fingerprint = "|".join(
+            [request.get_full_path(), request.accepted_renderer.format or ""] + [str(part) for part in parts]
+        )
+        return quote_etag(hashlib.sha1(fingerprint.encode()).hexdigest())
+
+    def _not_modified(self, request, etag, last_modified):
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = parse_etags(if_none_match)
+            return "*" in tags or etag in tags
+        since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+        return since is not None and last_modified is not None and int(last_modified.timestamp()) <= since
+
+    def _expanded_lookups(self):
+        """`updated_at` lookups of the relations `?expand=` embeds, or None if one cannot be validated"""
+        tree = self.requested_expansions() if hasattr(self, "requested_expansions") else {}
+        lookups = []
+
+        def walk(serializer_class, model, subtree, prefix):
+            expandable = getattr(serializer_class, "expandable_fields", {})
+            for name, children in subtree.items():
+                if name not in expandable:
+                    continue
+                child_class, kwargs = expandable[name]
+                path = prefix + [kwargs.get("source", name)]
+                related = model._meta.get_field(path[-1]).related_model
+                try:
+                    related._meta.get_field("updated_at")
+                except FieldDoesNotExist:
+                    return False
+                lookups.append("__".join(path + ["updated_at"]))
+                if not walk(child_class, related, children, path):
+                    return False
+            return True
+
+        if not walk(self.get_serializer_class(), self.get_queryset().model, tree, []):
+            return None
+        return lookups
+
+    def _conditional(self, request, etag, last_modified, render):
+        headers = {"ETag": etag}
+        if last_modified is not None:
+            headers["Last-Modified"] = http_date(last_modified.timestamp())
+        if self._not_modified(request, etag, last_modified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response = render()
+        if response.status_code == status.HTTP_200_OK:
+            for header, value in headers.items():
+                response[header] = value
+        return response
+
+    def list(self, request, *args, **kwargs):
+        expanded = self._expanded_lookups()
+        if expanded is None:
+            return super().list(request, *args, **kwargs)
+        state = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+            last_modified=Max("updated_at"),
+            # Expanding a to-many relation repeats rows in the join.
+            count=Count("pk", distinct=bool(expanded)),
+            **{f"expanded_{index}": Max(lookup) for index, lookup in enumerate(expanded)},
+        )
+        related = [state[f"expanded_{index}"] for index in range(len(expanded))]
+        last_modified = _latest(state["last_modified"], *related)
+        etag = self._etag(request, state["count"], state["last_modified"], *related)
+        return self._conditional(
+            request, etag, last_modified, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        expanded = self._expanded_lookups()
+        if expanded is None:
+            return super().retrieve(request, *args, **kwargs)
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            state = (
+                self.get_queryset().filter(**{self.lookup_field: lookup}).order_by()
+                .aggregate(updated_at=Max("updated_at"), **{f"expanded_{index}": Max(path) for index, path in enumerate(expanded)})
+            )
+        except (TypeError, ValueError, ValidationError):
+            state = {"updated_at": None}
+        if state["updated_at"] is None:
+            # Let the normal path produce the 404.
+            return super().retrieve(request, *args, **kwargs)
+        related = [state[f"expanded_{index}"] for index in range(len(expanded))]
+        etag = self._etag(request, state["updated_at"], *related)
+        return self._conditional(
+            request, etag, _latest(state["updated_at"], *related),
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+        )
+
+
+def _latest(*values):
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
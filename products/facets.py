@@ -0,0 +1,170 @@
+"""
+Storefront filtering and facet counts.
+
+Facets are computed from a single grouped query over the storefront
+products (search and price range applied in SQL), grouped by category,
+brand, price band and stock band. Each facet is then counted in Python
+with every other facet selection applied but not its own, so picking a
+category still shows counts for the sibling categories.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, Value, When
+
+from .inventory import LOW_STOCK_THRESHOLD
+from .models import Product
+from .search import search_products
+from .snapshot import catalog_version
+
+PRICE_BANDS = (
+    ("0-25", "Under $25", 0, 25),
+    ("25-100", "$25 - $100", 25, 100),
+    ("100-500", "$100 - $500", 100, 500),
+    ("500+", "$500 & above", 500, None),
+)
+STOCK_BANDS = (
+    ("in", "In stock"),
+    ("low", "Low stock"),
+)
+
+
+def _parse_price(value):
+    try:
+        return float(value) if value not in (None, "") else None
+    except ValueError:
+        return None
+
+
+def storefront_filters(params):
+    """Normalise shop/facet query parameters into a hashable filter dict"""
+    return {
+        "search": (params.get("search") or "").strip(),
+        "category": params.get("category") or "all",
+        "brand": params.get("brand") or "",
+        "min_price": _parse_price(params.get("min_price")),
+        "max_price": _parse_price(params.get("max_price")),
+        "stock": params.get("stock") if params.get("stock") in dict(STOCK_BANDS) else "",
+    }
+
+
+def storefront_products(filters, products=None):
+    """Active, in-stock products narrowed by every storefront filter"""
+    products = Product.objects.filter(stock__gt=0, is_active=True) if products is None else products
+    if filters["search"]:
+        products = search_products(products, filters["search"])
+    if filters["category"] != "all":
+        products = products.filter(category__name=filters["category"])
+    if filters["brand"]:
+        products = products.filter(brand=filters["brand"])
+    if filters["min_price"] is not None:
+        products = products.filter(price__gte=filters["min_price"])
+    if filters["max_price"] is not None:
+        products = products.filter(price__lte=filters["max_price"])
+    if filters["stock"] == "in":
+        products = products.filter(stock__gt=LOW_STOCK_THRESHOLD)
+    elif filters["stock"] == "low":
+        products = products.filter(stock__gt=0, stock__lte=LOW_STOCK_THRESHOLD)
+    return products
+
+
+def matches_storefront_filters(product, filters):
+    """storefront_products() for a single in-memory product (search is not supported)"""
+    if not product.is_active or product.stock <= 0:
+        return False
+    if filters["category"] != "all" and product.category.name != filters["category"]:
+        return False
+    if filters["brand"] and product.brand != filters["brand"]:
+        return False
+    if filters["min_price"] is not None and product.price < filters["min_price"]:
+        return False
+    if filters["max_price"] is not None and product.price > filters["max_price"]:
+        return False
+    if filters["stock"] == "in":
+        return product.stock > LOW_STOCK_THRESHOLD
+    if filters["stock"] == "low":
+        return product.stock <= LOW_STOCK_THRESHOLD
+    return True
+
+
+def _band_expressions():
+    price_band = Case(
+        *[
+            When(price__gte=low, price__lt=high, then=Value(key)) if high is not None
+            else When(price__gte=low, then=Value(key))
+            for key, _, low, high in PRICE_BANDS
+        ],
+        output_field=CharField(),
+    )
+    stock_band = Case(
+        When(stock__gt=LOW_STOCK_THRESHOLD, then=Value("in")),
+        default=Value("low"),
+        output_field=CharField(),
+    )
+    return {"price_band": price_band, "stock_band": stock_band}
+
+
+def compute_facets(filters):
+    base_filters = dict(filters, category="all", brand="", stock="")
+    rows = list(
+        storefront_products(base_filters)
+        .order_by()
+        .annotate(**_band_expressions())
+        .values("category_id", "category__name", "brand", "price_band", "stock_band")
+        .annotate(count=Count("id"))
+    )
+
+    def matches(row, skip):
+        return (
+            (skip == "category" or filters["category"] == "all" or row["category__name"] == filters["category"])
+            and (skip == "brand" or not filters["brand"] or row["brand"] == filters["brand"])
+            and (skip == "stock" or not filters["stock"] or row["stock_band"] == filters["stock"])
+        )
+
+    def tally(skip, key):
+        counts = {}
+        for row in rows:
+            if matches(row, skip):
+                counts[key(row)] = counts.get(key(row), 0) + row["count"]
+        return counts
+
+    categories = tally("category", lambda row: (row["category_id"], row["category__name"]))
+    brands = tally("brand", lambda row: row["brand"])
+    prices = tally(None, lambda row: row["price_band"])
+    stocks = tally("stock", lambda row: row["stock_band"])
+    return {
+        "count": sum(row["count"] for row in rows if matches(row, None)),
+        "facets": {
+            "category": [
+                {"id": pk, "value": name, "count": count}
+                for (pk, name), count in sorted(categories.items(), key=lambda item: item[0][1])
+            ],
+            "brand": [
+                {"value": brand, "count": count}
+                for brand, count in sorted(brands.items(), key=lambda item: item[0] or "")
+                if brand
+            ],
+            "price": [
+                {"value": key, "label": label, "count": prices.get(key, 0)}
+                for key, label, _, _ in PRICE_BANDS
+            ],
+            "stock": [
+                {"value": key, "label": label, "count": stocks.get(key, 0)}
+                for key, label in STOCK_BANDS
+            ],
+        },
+    }
+
+
+def get_facets(filters):
+    """compute_facets() behind the cache, keyed on the catalog version and the normalised filters"""
+    digest = hashlib.md5(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+    key = f"products:facets:{catalog_version()}:{digest}"
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(filters)
+        cache.set(key, facets, getattr(settings, "PRODUCT_FACETS_CACHE_TIMEOUT", 120))
+    return facets
@@ -0,0 +1,174 @@
+"""
+Read-only fast path for high-volume list endpoints.
+
+A ModelSerializer builds a model instance per row and walks its field
+objects for every attribute. FastListSerializer instead reads only the
+columns it needs with values() and renders each one through a converter
+picked once from the DRF field that would otherwise render it, so the
+JSON is identical. Plain columns whose DRF representation is the database
+value itself (strings, integers, booleans, primary keys, JSON) are copied
+as they are. Decimals and datetimes follow the DRF field's rules, with the
+quantize context and timezone resolved once per serializer instead of per
+value; anything else goes through the field's to_representation. Fields
+that are not a single column (method fields, nested serializers) are
+rendered by `get_<name>(row)` on the subclass.
+"""
+
+import decimal
+from datetime import datetime
+from decimal import Decimal
+from functools import cache
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .fieldsets import SparseFieldsetMixin
+
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.JSONField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+@cache
+def _fields(serializer_class):
+    return serializer_class().fields
+
+
+def _file_url(storage, request):
+    def convert(name):
+        if not name:
+            return None
+        url = storage.url(name)
+        return request.build_absolute_uri(url) if request is not None else url
+    return convert
+
+
+def _decimal(field):
+    """DecimalField.to_representation for the default string output, with the quantize context built once"""
+    coerce_to_string = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.localize or field.normalize_output or field.decimal_places is None:
+        return field.to_representation
+    exponent = Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        if not isinstance(value, Decimal):
+            return field.to_representation(value)
+        return format(value.quantize(exponent, rounding=rounding, context=context), "f")
+    return convert
+
+
+def _datetime(field):
+    """DateTimeField.to_representation for ISO 8601 output, with the timezone looked up once"""
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if not isinstance(value, datetime) or not timezone.is_aware(value):
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+    return convert
+
+
+def _converter(model, field, request):
+    if isinstance(field, serializers.FileField):
+        return _file_url(model._meta.get_field(field.source).storage, request)
+    if isinstance(field, PASSTHROUGH_FIELDS):
+        return None
+    if isinstance(field, serializers.DecimalField):
+        return _decimal(field)
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime(field)
+    return field.to_representation
+
+
+class FastListSerializer:
+    """
+    Render values() rows exactly as `serializer_class(many=True)` renders
+    instances. `computed_fields` maps each field rendered by a
+    `get_<name>(row)` method to the columns that method reads.
+    """
+    serializer_class = None
+    computed_fields = {}
+
+    def __init__(self, context=None, fields=None):
+        self.context = context or {}
+        request = self.context.get("request")
+        model = self.serializer_class.Meta.model
+        self.plan = []
+        for name, field in _fields(self.serializer_class).items():
+            if fields is not None and name not in fields:
+                continue
+            if name in self.computed_fields:
+                self.plan.append((name, None, getattr(self, f"get_{name}")))
+            elif field.source == "*" or "." in field.source or isinstance(field, serializers.BaseSerializer):
+                raise ImproperlyConfigured(f"{type(self).__name__} needs a get_{name}() for field {name!r}")
+            else:
+                self.plan.append((name, field.source, _converter(model, field, request)))
+
+    @property
+    def field_names(self):
+        return [name for name, _, _ in self.plan]
+
+    def columns(self):
+        columns = []
+        for name, column, _ in self.plan:
+            columns.extend(self.computed_fields[name] if column is None else [column])
+        return list(dict.fromkeys(columns))
+
+    def prepare(self, rows):
+        """Fetch whatever the computed fields need for `rows` in bulk"""
+
+    def serialize(self, rows):
+        rows = list(rows)
+        self.prepare(rows)
+        plan = self.plan
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, convert in plan:
+                if column is None:
+                    item[name] = convert(row)
+                else:
+                    value = row[column]
+                    item[name] = value if value is None or convert is None else convert(value)
+            data.append(item)
+        return data
+
+
+class FastListMixin(SparseFieldsetMixin):
+    """
+    `list` for ModelViewSets through `fast_list_serializer_class` instead of
+    the ModelSerializer. `?fields=` narrows the columns read; `?expand=`
+    needs nested serializers and takes the regular path.
+    """
+    fast_list_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.requested_expansions():
+            return super().list(request, *args, **kwargs)
+        # values() rows cannot take prefetches; the fast serializer fetches its own.
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        fast = self.fast_list_serializer_class(context=self.get_serializer_context(), fields=self.requested_fields())
+        # Keyset pagination reads the sort key back from each row.
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        sort_keys = [field.lstrip("-") for field in ordering if isinstance(field, str)]
+        rows = queryset.values(*dict.fromkeys(fast.columns() + sort_keys + ["pk"]))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast.serialize(page))
+        return Response(fast.serialize(rows))
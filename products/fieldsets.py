@@ -0,0 +1,189 @@
+"""
+Sparse fieldsets and on-demand expansion for the REST API.
+
+`?fields=id,name,price` limits a response to those top-level fields, and
+`?expand=category` (dotted for nested serializers, e.g.
+`?expand=items.product`) renders a related object in full instead of its
+primary key. Both shape the query as well as the output: the serializer
+that will render the response is walked to find the columns and relations
+it reads, and the queryset gets the matching only(), select_related() and
+prefetch_related(). Method fields and model properties say which columns
+they read through the serializer's `field_sources`; a level with a field
+that cannot be mapped to columns is loaded in full rather than risk a
+deferred load per row.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_fields(value):
+    """`?fields=` as a set of names, or None when every field is wanted"""
+    names = {name.strip() for name in (value or "").split(",") if name.strip()}
+    return names or None
+
+
+def parse_expand(value):
+    """`?expand=` as a tree of names: "items.product,user" -> {"items": {"product": {}}, "user": {}}"""
+    tree = {}
+    for path in (value or "").split(","):
+        node = tree
+        for name in path.strip().split("."):
+            if name:
+                node = node.setdefault(name, {})
+    return tree
+
+
+class ExpandableFieldsMixin:
+    """
+    ModelSerializer mixin taking `fields` and `expand` keyword arguments.
+    `expandable_fields` maps a field name to the (serializer class, kwargs)
+    rendering it when expanded; `field_sources` maps fields that are not a
+    model column to the (dotted) columns they read.
+    """
+    expandable_fields = {}
+    field_sources = {}
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        self.requested_fields = fields
+        self.expand = expand or {}
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name, subtree in self.expand.items():
+            if name not in self.expandable_fields:
+                continue
+            serializer_class, kwargs = self.expandable_fields[name]
+            if issubclass(serializer_class, ExpandableFieldsMixin):
+                kwargs = dict(kwargs, expand=subtree)
+            fields[name] = serializer_class(read_only=True, **kwargs)
+        if self.requested_fields is not None:
+            fields = {name: field for name, field in fields.items() if name in self.requested_fields}
+        return fields
+
+
+def _relation(model, name):
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    return field if field.is_relation else None
+
+
+def _forward(field):
+    """A relation that select_related() can follow"""
+    return field.is_relation and field.concrete and (field.many_to_one or field.one_to_one)
+
+
+def _sources(serializer, name, field):
+    """Dotted model paths read by `field`, or None when they are unknown"""
+    declared = getattr(serializer, "field_sources", {})
+    if name in declared:
+        return declared[name]
+    if field.source == "*":
+        return None
+    return [field.source]
+
+
+def plan_queryset(serializer, model):
+    """(only, select_related, prefetches) for rendering `model` rows with `serializer`"""
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    only, select, prefetch = {model._meta.pk.name}, [], []
+    complete = True
+    for name, field in serializer.fields.items():
+        if isinstance(field, serializers.BaseSerializer):
+            relation = _relation(model, field.source)
+            if relation is None:
+                complete = False
+            elif _forward(relation):
+                child_only, child_select, child_prefetch = plan_queryset(field, relation.related_model)
+                only.add(field.source)
+                select.append(field.source)
+                select.extend(f"{field.source}__{path}" for path in child_select)
+                prefetch.extend(Prefetch(f"{field.source}__{p.prefetch_through}", queryset=p.queryset) for p in child_prefetch)
+                if child_only is not None:
+                    # Naming no column of the related model loads all of them.
+                    only.update(f"{field.source}__{column}" for column in child_only)
+            else:
+                prefetch.append(Prefetch(field.source, queryset=optimize_queryset(
+                    relation.related_model._default_manager.all(), field, keep=[relation.field.name]
+                )))
+            continue
+        sources = _sources(serializer, name, field)
+        if sources is None:
+            complete = False
+            continue
+        for source in sources:
+            parts, current = source.split("."), model
+            for depth, part in enumerate(parts):
+                path = "__".join(parts[:depth + 1])
+                try:
+                    model_field = current._meta.get_field(part)
+                except FieldDoesNotExist:
+                    # A property or method; its inputs are unknown.
+                    complete = False
+                    break
+                if depth == len(parts) - 1:
+                    if model_field.concrete:
+                        only.add(path)
+                    else:
+                        complete = False
+                elif _forward(model_field):
+                    select.append(path)
+                    only.add(path)
+                    current = model_field.related_model
+                else:
+                    complete = False
+                    break
+    return (only if complete else None), list(dict.fromkeys(select)), prefetch
+
+
+def optimize_queryset(queryset, serializer, keep=()):
+    """Narrow `queryset` to what `serializer` renders; `keep` lists extra columns to load"""
+    only, select, prefetch = plan_queryset(serializer, queryset.model)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    if only is not None:
+        queryset = queryset.only(*only, *keep)
+    return queryset
+
+
+class SparseFieldsetMixin:
+    """`?fields=` / `?expand=` for GenericAPIView subclasses whose serializer uses ExpandableFieldsMixin"""
+
+    def requested_fields(self):
+        if self.request.method not in SAFE_METHODS:
+            return None
+        return parse_fields(self.request.query_params.get("fields"))
+
+    def requested_expansions(self):
+        if self.request.method not in SAFE_METHODS:
+            return {}
+        return parse_expand(self.request.query_params.get("expand"))
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", self.requested_fields())
+        kwargs.setdefault("expand", self.requested_expansions())
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        serializer_class = self.get_serializer_class()
+        serializer = serializer_class(
+            fields=self.requested_fields(), expand=self.requested_expansions(), context=self.get_serializer_context()
+        )
+        # Pagination cursors read the sort key from each row.
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        keep = [
+            name for name in (field.lstrip("-") for field in ordering if isinstance(field, str))
+            if "__" not in name and name != "pk" and name not in queryset.query.annotations
+        ]
+        return optimize_queryset(queryset, serializer, keep=keep)
@@ -0,0 +1,154 @@
+"""
+Derivative images for Product.image.
+
+Each upload gets a thumbnail, card and full variant, written next to the
+original as `<name>.<variant>.<content hash>.<ext>` so the URLs never
+change for the same bytes and can be cached forever. The names are kept
+in Product.image_variants together with the source they were built from.
+
+Generation runs on a small per-process thread pool once the saving
+transaction commits (products.signals), or lazily the first time a
+template asks for a missing variant; `generate_image_variants` backfills
+existing products.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections
+from django.db.models.functions import Now
+from PIL import Image, ImageOps
+
+from .models import Product
+from .snapshot import bump_catalog_version
+
+logger = logging.getLogger(__name__)
+
+VARIANTS = {
+    "thumbnail": (160, 160),
+    "card": (480, 480),
+    "full": (1200, 1200),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+_in_flight = set()
+_failed = set()
+
+
+def variants_current(product):
+    return bool(product.image) and product.image_variants.get("source") == product.image.name
+
+
+def variant_name(image_name, variants, variant):
+    """Storage name of `variant` when it was generated from `image_name`, else `image_name`"""
+    if variants.get("source") == image_name and variant in variants:
+        return variants[variant]
+    return image_name
+
+
+def variant_url(product, variant):
+    """URL of `variant` when it has been generated, else the original image URL"""
+    if not product.image:
+        return ""
+    return product.image.storage.url(variant_name(product.image.name, product.image_variants, variant))
+
+
+def _render(source, size):
+    image = source.copy()
+    image.thumbnail(size, Image.LANCZOS)
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    buffer = io.BytesIO()
+    if has_alpha:
+        image.save(buffer, "PNG", optimize=True)
+        return buffer.getvalue(), "png"
+    image.convert("RGB").save(buffer, "JPEG", quality=85, optimize=True, progressive=True)
+    return buffer.getvalue(), "jpg"
+
+
+def build_variants(product):
+    """Write every variant for `product.image`; returns the new image_variants dict"""
+    storage = product.image.storage
+    stem = os.path.splitext(product.image.name)[0]
+    with storage.open(product.image.name, "rb") as fh:
+        source = ImageOps.exif_transpose(Image.open(fh))
+        source.load()
+    variants = {"source": product.image.name}
+    for variant, size in VARIANTS.items():
+        data, ext = _render(source, size)
+        digest = hashlib.sha1(data).hexdigest()[:12]
+        name = f"{stem}.{variant}.{digest}.{ext}"
+        if not storage.exists(name):
+            name = storage.save(name, ContentFile(data))
+        variants[variant] = name
+    return variants
+
+
+def generate_variants(product_id, force=False):
+    """Build and store the variants for one product; returns True if anything was written"""
+    product = Product.objects.filter(pk=product_id).only("image", "image_variants").first()
+    if product is None or not product.image or (variants_current(product) and not force):
+        return False
+    previous = product.image_variants
+    variants = build_variants(product)
+    updated = Product.objects.filter(pk=product_id, image=product.image.name).update(
+        image_variants=variants, updated_at=Now()
+    )
+    if not updated:
+        # The image changed while we were rendering; the newer save schedules its own run.
+        return False
+    storage = product.image.storage
+    removed = False
+    for variant in VARIANTS:
+        stale = previous.get(variant)
+        if stale and stale != variants[variant] and storage.exists(stale):
+            storage.delete(stale)
+            removed = True
+    if removed:
+        # Snapshots may still link the deleted files. New variants alone can
+        # wait for the next reload; until then the original image is shown.
+        bump_catalog_version()
+    return True
+
+
+def _executor_instance():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "PRODUCT_IMAGE_WORKERS", 2),
+                thread_name_prefix="product-images",
+            )
+        return _executor
+
+
+def _run(product_id):
+    try:
+        generate_variants(product_id)
+    except Exception:
+        logger.exception("Could not generate image variants for product %s", product_id)
+        with _executor_lock:
+            _failed.add(product_id)
+    finally:
+        with _executor_lock:
+            _in_flight.discard(product_id)
+        connections.close_all()
+
+
+def schedule_variants(product_id, retry=True):
+    """
+    Queue variant generation for `product_id` unless it is already queued.
+    With retry=False a product whose generation failed in this process is skipped.
+    """
+    with _executor_lock:
+        if product_id in _in_flight or (not retry and product_id in _failed):
+            return
+        _failed.discard(product_id)
+        _in_flight.add(product_id)
+    _executor_instance().submit(_run, product_id)
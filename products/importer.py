@@ -0,0 +1,189 @@
+"""
+Bulk product import from CSV or JSON Lines feeds.
+
+Rows are upserted by `sku` in batches with a single INSERT ... ON CONFLICT
+per batch; categories are resolved through an in-memory name -> id map and
+created in bulk when the feed introduces new ones. After every committed
+batch the number of consumed rows is written to a checkpoint file, so a
+failed import can pick up from the last good batch.
+"""
+
+import csv
+import json
+import os
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from .models import Category, Product
+from .signals import products_bulk_changed
+
+UPDATE_FIELDS = ["name", "description", "price", "stock", "category", "brand", "weight", "is_active", "updated_at"]
+TRUE_VALUES = {"1", "true", "yes", "y", "t"}
+
+
+class RowError(ValueError):
+    pass
+
+
+def read_rows(path, fmt=None):
+    """Yield one dict per record of a CSV or JSONL file without loading it into memory"""
+    fmt = fmt or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+    with open(path, newline="", encoding="utf-8") as fh:
+        if fmt == "csv":
+            for row in csv.DictReader(fh):
+                yield row
+        else:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _decimal(value, field, required=False):
+    if value in (None, ""):
+        if required:
+            raise RowError(f"{field} is required")
+        return None
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        raise RowError(f"invalid {field}: {value!r}")
+
+
+def parse_row(row):
+    if not isinstance(row, dict):
+        raise RowError("expected an object")
+    sku = str(row.get("sku") or "").strip()
+    name = str(row.get("name") or "").strip()
+    category = str(row.get("category") or "").strip()
+    if not sku:
+        raise RowError("sku is required")
+    if not name:
+        raise RowError("name is required")
+    if not category:
+        raise RowError("category is required")
+    try:
+        stock = int(row.get("stock") or 0)
+    except (TypeError, ValueError):
+        raise RowError(f"invalid stock: {row.get('stock')!r}")
+    is_active = row.get("is_active", True)
+    if isinstance(is_active, str):
+        is_active = is_active.strip().lower() in TRUE_VALUES if is_active.strip() else True
+    return {
+        "sku": sku,
+        "name": name,
+        "description": row.get("description") or "",
+        "price": _decimal(row.get("price"), "price", required=True),
+        "stock": stock,
+        "category": category,
+        "brand": row.get("brand") or None,
+        "weight": _decimal(row.get("weight"), "weight"),
+        "is_active": bool(is_active),
+    }
+
+
+class CategoryMap:
+    """Category name -> id, creating unknown names in bulk"""
+
+    def __init__(self):
+        self.ids = dict(Category.objects.values_list("name", "id"))
+
+    def resolve(self, names):
+        missing = {name for name in names if name not in self.ids}
+        if missing:
+            Category.objects.bulk_create([Category(name=name) for name in missing], ignore_conflicts=True)
+            self.ids.update(Category.objects.filter(name__in=missing).values_list("name", "id"))
+        return self.ids
+
+
+def upsert_batch(rows, categories):
+    """Insert or update one batch of parsed rows; returns the affected product ids"""
+    # Later rows for the same SKU win, as they would row by row.
+    rows = list({row["sku"]: row for row in rows}.values())
+    category_ids = categories.resolve({row["category"] for row in rows})
+    products = [
+        Product(category_id=category_ids[row["category"]], **{k: v for k, v in row.items() if k != "category"})
+        for row in rows
+    ]
+    with transaction.atomic():
+        Product.objects.bulk_create(
+            products,
+            update_conflicts=True,
+            unique_fields=["sku"],
+            update_fields=UPDATE_FIELDS,
+        )
+        return list(Product.objects.filter(sku__in=[row["sku"] for row in rows]).values_list("id", flat=True))
+
+
+class Checkpoint:
+    """Number of rows of `input_path` already imported, stored as JSON at `path`"""
+
+    def __init__(self, path, input_path):
+        if not os.path.isfile(input_path):
+            raise FileNotFoundError(input_path)
+        self.path = path
+        self.source = {"input": os.path.abspath(input_path)}
+
+    def load(self):
+        try:
+            with open(self.path) as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return 0
+        if any(data.get(key) != value for key, value in self.source.items()):
+            return 0
+        return int(data.get("rows_done", 0))
+
+    def save(self, rows_done):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump(dict(self.source, rows_done=rows_done), fh)
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def import_products(rows, batch_size=1000, skip=0, on_batch=None, on_error=None):
+    """
+    Upsert products from an iterable of raw rows.
+
+    The first `skip` rows are passed over. After each committed batch
+    `on_batch(rows_done, imported)` is called; `on_error(row_number, error)`
+    is called for rows that fail validation. Returns (rows_done, imported, errors).
+    """
+    categories = CategoryMap()
+    rows_done = imported = errors = 0
+    batch = []
+
+    def flush():
+        nonlocal imported
+        if batch:
+            # Categories that existing SKUs may be moved out of.
+            previous = set(
+                Product.objects.filter(sku__in=[row["sku"] for row in batch])
+                .values_list("category_id", flat=True).distinct()
+            )
+            product_ids = upsert_batch(batch, categories)
+            imported += len(product_ids)
+            batch.clear()
+            products_bulk_changed.send(sender=Product, product_ids=product_ids, category_ids=previous)
+        if on_batch:
+            on_batch(rows_done, imported)
+
+    for number, row in enumerate(rows, start=1):
+        if number <= skip:
+            rows_done = number
+            continue
+        try:
+            batch.append(parse_row(row))
+        except RowError as exc:
+            errors += 1
+            if on_error:
+                on_error(number, exc)
+        rows_done = number
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    return rows_done, imported, errors
@@ -0,0 +1,42 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import Product
+from .snapshot import catalog_version
+
+LOW_STOCK_THRESHOLD = 10
+
+STOCK_BUCKETS = {
+    "total": Count("id"),
+    "active": Count("id", filter=Q(is_active=True)),
+    "in_stock": Count("id", filter=Q(stock__gt=LOW_STOCK_THRESHOLD)),
+    "low_stock": Count("id", filter=Q(stock__gt=0, stock__lte=LOW_STOCK_THRESHOLD)),
+    "out_of_stock": Count("id", filter=Q(stock=0)),
+    "low_or_out_of_stock": Count("id", filter=Q(stock__lte=LOW_STOCK_THRESHOLD)),
+}
+
+
+def stock_summary(products=None, cache_timeout=None):
+    """Count every stock bucket for `products` with one conditional-aggregation query.
+
+    Pass cache_timeout (seconds) to reuse the result for identical querysets;
+    None falls back to INVENTORY_SUMMARY_CACHE_TIMEOUT and 0 disables caching.
+    Entries are keyed on the catalog version, which moves whenever a product
+    is added, removed, (de)activated or crosses a stock band, so a cached
+    summary never outlives a change to the counts.
+    """
+    products = Product.objects.all() if products is None else products
+    if cache_timeout is None:
+        cache_timeout = getattr(settings, "INVENTORY_SUMMARY_CACHE_TIMEOUT", 0)
+    if not cache_timeout:
+        return products.order_by().aggregate(**STOCK_BUCKETS)
+    digest = hashlib.md5(str(products.order_by().query).encode()).hexdigest()
+    key = f"inventory:summary:{catalog_version()}:{digest}"
+    summary = cache.get(key)
+    if summary is None:
+        summary = products.order_by().aggregate(**STOCK_BUCKETS)
+        cache.set(key, summary, cache_timeout)
+    return summary
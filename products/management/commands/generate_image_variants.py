@@ -0,0 +1,38 @@
+"""
+Management command to build thumbnail/card/full variants for product images.
+
+Usage:
+    python manage.py generate_image_variants
+    python manage.py generate_image_variants --force
+"""
+
+from django.core.management.base import BaseCommand
+from products.images import generate_variants, variants_current
+from products.models import Product
+
+
+class Command(BaseCommand):
+    help = 'Generate missing or stale image variants for every product with an image'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild variants even when they are already current',
+        )
+
+    def handle(self, *args, **options):
+        products = Product.objects.exclude(image="").exclude(image__isnull=True).only("image", "image_variants")
+        generated = failed = 0
+        for product in products.order_by('pk').iterator():
+            if variants_current(product) and not options['force']:
+                continue
+            try:
+                if generate_variants(product.pk, force=options['force']):
+                    generated += 1
+            except Exception as exc:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f'  ✗ Product #{product.pk} ({product.image.name}): {exc}'))
+        self.stdout.write(self.style.SUCCESS(f'✓ Generated variants for {generated} products'))
+        if failed:
+            self.stdout.write(self.style.WARNING(f'{failed} product image(s) could not be processed'))
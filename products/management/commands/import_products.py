@@ -0,0 +1,86 @@
+"""
+Management command to bulk import products from a CSV or JSON Lines feed.
+
+Rows are upserted by SKU. Columns: sku, name, category, price, stock,
+description, brand, weight, is_active. Progress is checkpointed after every
+batch; re-running the same command after a failure (or after fixing the
+offending line) resumes from the last committed batch.
+
+Usage:
+    python manage.py import_products feed.csv
+    python manage.py import_products feed.jsonl --batch-size 5000
+    python manage.py import_products feed.csv --restart
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from products.importer import Checkpoint, import_products, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Upsert products by SKU from a CSV or JSONL file in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSONL file to import')
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'jsonl'],
+            help='Input format (default: guessed from the file extension)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows upserted per statement',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Checkpoint file (default: <path>.checkpoint)',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore any checkpoint and import the whole file again',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            checkpoint = Checkpoint(options['checkpoint'] or f'{path}.checkpoint', path)
+        except OSError as exc:
+            raise CommandError(f'Cannot read {path}: {exc}')
+        skip = 0 if options['restart'] else checkpoint.load()
+        if skip:
+            self.stdout.write(self.style.WARNING(f'Resuming after row {skip} from {checkpoint.path}'))
+
+        started = time.monotonic()
+
+        def on_batch(rows_done, imported):
+            checkpoint.save(rows_done)
+            elapsed = time.monotonic() - started
+            rate = imported / elapsed if elapsed else 0
+            self.stdout.write(f'  {rows_done} rows read, {imported} upserted ({rate:,.0f} rows/s)')
+
+        def on_error(number, error):
+            self.stdout.write(self.style.ERROR(f'  ✗ Row {number}: {error}'))
+
+        try:
+            rows_done, imported, errors = import_products(
+                read_rows(path, options['format']),
+                batch_size=options['batch_size'],
+                skip=skip,
+                on_batch=on_batch,
+                on_error=on_error,
+            )
+        except Exception as exc:
+            raise CommandError(
+                f'Import stopped: {exc}. Re-run the command to resume from the last committed batch.'
+            )
+        checkpoint.clear()
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Imported {imported} products from {rows_done - skip} rows in {elapsed:.1f}s'
+        ))
+        if errors:
+            self.stdout.write(self.style.WARNING(f'{errors} row(s) were skipped'))
@@ -0,0 +1,19 @@
+"""
+Management command to rebuild the product full-text search index.
+
+Usage:
+    python manage.py rebuild_search_index
+"""
+
+from django.core.management.base import BaseCommand
+from products.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the product search index for the configured backend'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        self.stdout.write(f'Rebuilding search index with {backend.__class__.__name__}...')
+        indexed = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'✓ Indexed {indexed} products'))
@@ -0,0 +1,21 @@
+"""
+Management command to recompute the denormalised stats on every category.
+
+Category.active_product_count, min_price and max_price are kept up to date
+as products are written; this corrects any that drifted because products
+were changed around the ORM (raw SQL, queryset.update()).
+
+Usage:
+    python manage.py reconcile_category_stats
+"""
+
+from django.core.management.base import BaseCommand
+from products.category_stats import refresh_category_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute active product counts and price ranges for all categories'
+
+    def handle(self, *args, **options):
+        corrected = refresh_category_stats()
+        self.stdout.write(self.style.SUCCESS(f'✓ Category stats reconciled ({corrected} corrected)'))
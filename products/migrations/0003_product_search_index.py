@@ -0,0 +1,48 @@
+from django.db import migrations
+
+FTS_TABLE = 'products_product_fts'
+PG_INDEX = 'products_product_search_idx'
+PG_VECTOR = (
+    "to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, '') || ' ' || coalesce(brand, ''))"
+)
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            try:
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+                    f"USING fts5(name, description, brand, tokenize='unicode61 remove_diacritics 2')"
+                )
+            except Exception:
+                # SQLite built without FTS5: products.search falls back to icontains.
+                return
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, name, description, brand) "
+                f"SELECT id, name, coalesce(description, ''), coalesce(brand, '') FROM products_product"
+            )
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON products_product USING GIN ({PG_VECTOR})"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute(f"DROP INDEX IF EXISTS {PG_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_alter_product_options_product_created_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='views',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+    ]
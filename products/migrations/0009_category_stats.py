@@ -0,0 +1,42 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:41
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_stats(apps, schema_editor):
+    Category = apps.get_model('products', 'Category')
+    Product = apps.get_model('products', 'Product')
+    active = Product.objects.filter(category=OuterRef('pk'), is_active=True, stock__gt=0).order_by().values('category')
+    Category.objects.update(
+        active_product_count=Coalesce(Subquery(active.annotate(value=Count('pk')).values('value')), Value(0)),
+        min_price=Subquery(active.annotate(value=Min('price')).values('value')),
+        max_price=Subquery(active.annotate(value=Max('price')).values('value')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0008_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='active_product_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='max_price',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='min_price',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
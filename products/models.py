@@ -4,11 +4,17 @@ from django.utils import timezone
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Storefront stats (active, in-stock products), kept current by products.category_stats
+    active_product_count = models.PositiveIntegerField(default=0, editable=False)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False)
 
     def __str__(self):
         return self.name
 
 class Product(models.Model):
+    sku = models.CharField(max_length=64, unique=True, blank=True, null=True)
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True, null=True)
     price = models.DecimalField(max_digits=10, decimal_places=2)
@@ -18,10 +24,17 @@ class Product(models.Model):
     weight = models.DecimalField(max_digits=6, decimal_places=2, blank=True, null=True, help_text="Weight in KG")
     is_active = models.BooleanField(default=True)
     image = models.ImageField(upload_to="products/", blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(default=timezone.now)  
+    views = models.PositiveIntegerField(default=0, db_index=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ['-created_at']  
+        indexes = [
+            models.Index(fields=["is_active", "stock", "created_at"]),
+            models.Index(fields=["category", "price"]),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.brand})" if self.brand else self.name
\ No newline at end of file
@@ -0,0 +1,279 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are addressed by the sort key of the last row seen instead of an
+OFFSET, and no COUNT(*) is run, so every page costs one indexed range
+scan regardless of how deep it is. The ordering must end in a unique
+column; `id` is appended when it does not. Ordering fields must be
+non-null columns or annotations on the queryset.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+DEFAULT_MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def keyset_ordering(queryset, ordering=None):
+    """The queryset's ordering as a tuple of field names ending in a unique key"""
+    ordering = list(ordering or queryset.query.order_by or queryset.model._meta.ordering or ["-pk"])
+    for field in ordering:
+        if not isinstance(field, str) or "__" in field or field.lstrip("-") == "?":
+            raise ValueError(f"Keyset pagination cannot order by {field!r}")
+    names = [field.lstrip("-") for field in ordering]
+    pk_name = queryset.model._meta.pk.name
+    if not {"pk", "id", pk_name} & set(names):
+        ordering.append("-pk" if ordering[0].startswith("-") else "pk")
+    return tuple(ordering)
+
+
+def encode_cursor(values, reverse=False):
+    payload = {"v": [_encode_value(value) for value in values]}
+    if reverse:
+        payload["r"] = 1
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor, model, ordering):
+    """Return (values, reverse) for `cursor`, converted to the ordering field types"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        values = payload["v"]
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError):
+        raise InvalidCursor("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise InvalidCursor("Invalid cursor")
+    try:
+        values = [_decode_value(model, field.lstrip("-"), value) for field, value in zip(ordering, values)]
+    except (ValidationError, ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+    return values, bool(payload.get("r"))
+
+
+def _encode_value(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(model, name, value):
+    try:
+        field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+    except FieldDoesNotExist:
+        # An annotation such as search_rank; JSON already round-trips it.
+        return value
+    if field.get_internal_type() == "DateTimeField":
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValueError(value)
+        return parsed
+    return field.to_python(value)
+
+
+def _row_value(obj, name):
+    if isinstance(obj, dict):
+        # A values() row; it must include every ordering field (and "pk").
+        return obj[name]
+    return obj.pk if name == "pk" else getattr(obj, name)
+
+
+def _after(ordering, values):
+    """Rows sorting strictly after `values` under `ordering`"""
+    condition = Q(pk__in=[])
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition |= equal & Q(**{f"{name}__{lookup}": value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+def _flip(ordering):
+    return tuple(field[1:] if field.startswith("-") else "-" + field for field in ordering)
+
+
+class KeysetPage:
+    """One page of results plus the cursors of its neighbours"""
+
+    def __init__(self, object_list, ordering, has_next, has_previous):
+        self.object_list = object_list
+        self.ordering = ordering
+        self.has_next = has_next
+        self.has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def _cursor(self, obj, reverse):
+        return encode_cursor([_row_value(obj, field.lstrip("-")) for field in self.ordering], reverse)
+
+    @property
+    def next_cursor(self):
+        if not (self.has_next and self.object_list):
+            return None
+        return self._cursor(self.object_list[-1], False)
+
+    @property
+    def previous_cursor(self):
+        if not (self.has_previous and self.object_list):
+            return None
+        return self._cursor(self.object_list[0], True)
+
+
+def keyset_page(queryset, cursor=None, page_size=20, ordering=None):
+    """
+    Fetch the page after (or, for a reverse cursor, before) `cursor`.
+
+    Raises InvalidCursor when the cursor cannot be decoded.
+    """
+    ordering = keyset_ordering(queryset, ordering)
+    values, reverse = decode_cursor(cursor, queryset.model, ordering) if cursor else (None, False)
+    scan_ordering = _flip(ordering) if reverse else ordering
+    rows = queryset.order_by(*scan_ordering)
+    if values is not None:
+        rows = rows.filter(_after(scan_ordering, values))
+    rows = list(rows[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if reverse:
+        rows.reverse()
+        return KeysetPage(rows, ordering, has_next=True, has_previous=has_more)
+    return KeysetPage(rows, ordering, has_next=has_more, has_previous=values is not None)
+
+
+def _sort_rows(rows, ordering):
+    rows = list(rows)
+    for field in reversed(ordering):
+        name = field.lstrip("-")
+        rows.sort(key=lambda row: _row_value(row, name), reverse=field.startswith("-"))
+    return rows
+
+
+def _sorts_after(row, ordering, values):
+    for field, value in zip(ordering, values):
+        current = _row_value(row, field.lstrip("-"))
+        if current != value:
+            return (current > value) != field.startswith("-")
+    return False
+
+
+def keyset_page_list(rows, model, cursor=None, page_size=20, ordering=("pk",)):
+    """keyset_page() over model instances already held in memory"""
+    ordering = tuple(ordering)
+    values, reverse = decode_cursor(cursor, model, ordering) if cursor else (None, False)
+    scan_ordering = _flip(ordering) if reverse else ordering
+    rows = _sort_rows(rows, scan_ordering)
+    if values is not None:
+        rows = [row for row in rows if _sorts_after(row, scan_ordering, values)]
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if reverse:
+        rows.reverse()
+        return KeysetPage(rows, ordering, has_next=True, has_previous=has_more)
+    return KeysetPage(rows, ordering, has_next=has_more, has_previous=values is not None)
+
+
+def paginate_request(request, queryset, page_size, ordering=None, max_page_size=DEFAULT_MAX_PAGE_SIZE):
+    """keyset_page() driven by `?cursor=` and `?page_size=`; a bad cursor restarts at the first page"""
+    page_size = _page_size(request.GET.get("page_size"), page_size, max_page_size)
+    try:
+        return keyset_page(queryset, request.GET.get("cursor"), page_size, ordering)
+    except InvalidCursor:
+        return keyset_page(queryset, None, page_size, ordering)
+
+
+def paginate_request_list(request, rows, model, page_size, ordering, max_page_size=DEFAULT_MAX_PAGE_SIZE):
+    """paginate_request() for an in-memory list of `model` instances"""
+    page_size = _page_size(request.GET.get("page_size"), page_size, max_page_size)
+    try:
+        return keyset_page_list(rows, model, request.GET.get("cursor"), page_size, ordering)
+    except InvalidCursor:
+        return keyset_page_list(rows, model, None, page_size, ordering)
+
+
+def _page_size(requested, default, maximum):
+    try:
+        size = int(requested)
+    except (TypeError, ValueError):
+        return default
+    return min(size, maximum) if size > 0 else default
+
+
+class KeysetPagination(BasePagination):
+    """
+    DRF pagination over the queryset's current ordering (as left by
+    OrderingFilter or the view), responding with next/previous links only.
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = api_settings.PAGE_SIZE or 20
+    max_page_size = DEFAULT_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = _page_size(request.query_params.get(self.page_size_query_param), self.page_size, self.max_page_size)
+        try:
+            self.page = keyset_page(queryset, request.query_params.get(self.cursor_query_param), page_size)
+        except InvalidCursor as exc:
+            raise NotFound(str(exc))
+        return self.page.object_list
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        return self._link(self.page.next_cursor)
+
+    def get_previous_link(self):
+        if not self.page.has_previous:
+            return None
+        if self.page.previous_cursor is None:
+            # Paged past the end; the way back is the first page.
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self._link(self.page.previous_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
@@ -0,0 +1,68 @@
+"""
+Buffered product view counts.
+
+Views are counted in memory per worker and written to Product.views in
+batches: one UPDATE ... SET views = views + n per distinct n, once
+PRODUCT_VIEW_FLUSH_SIZE views are pending or PRODUCT_VIEW_FLUSH_INTERVAL
+seconds have passed. The flush uses update(), so it does not bump the
+catalog version; storefront snapshots pick the new counts up on their
+next reload.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import F
+from django.db.models.functions import Now
+
+from .models import Product
+
+logger = logging.getLogger(__name__)
+
+_pending = Counter()
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def record_view(product_id):
+    """Count one view of `product_id`; flushes the buffer when it is due"""
+    with _lock:
+        _pending[product_id] += 1
+        due = (
+            sum(_pending.values()) >= getattr(settings, "PRODUCT_VIEW_FLUSH_SIZE", 100)
+            or time.monotonic() - _last_flush >= getattr(settings, "PRODUCT_VIEW_FLUSH_INTERVAL", 60)
+        )
+    if due:
+        flush_views()
+
+
+def flush_views():
+    """Write the buffered counts; returns the number of views written"""
+    global _last_flush
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+    if not pending:
+        return 0
+    by_count = defaultdict(list)
+    for product_id, count in pending.items():
+        by_count[count].append(product_id)
+    try:
+        with transaction.atomic():
+            for count, product_ids in by_count.items():
+                Product.objects.filter(pk__in=product_ids).update(views=F("views") + count, updated_at=Now())
+    except DatabaseError:
+        logger.exception("Could not flush product views; keeping them for the next flush")
+        with _lock:
+            _pending.update(pending)
+        return 0
+    return sum(pending.values())
+
+
+atexit.register(flush_views)
@@ -0,0 +1,170 @@
+"""
+Product full-text search.
+
+The backend is picked from the database vendor: SQLite uses an FTS5 table
+(products_product_fts) kept in sync by products.signals, PostgreSQL uses a
+GIN index over a tsvector expression that the database maintains itself.
+Anything else falls back to icontains lookups.
+"""
+
+import re
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Product
+
+FTS_TABLE = "products_product_fts"
+PG_INDEX = "products_product_search_idx"
+PG_DOCUMENT = (
+    "coalesce({table}name, '') || ' ' || coalesce({table}description, '') || ' ' || coalesce({table}brand, '')"
+)
+PG_VECTOR = "to_tsvector('english', " + PG_DOCUMENT + ")"
+
+_backends = {}
+
+
+def search_terms(query):
+    return re.findall(r"\w+", query or "")
+
+
+class SimpleSearchBackend:
+    """Case-insensitive substring matching; used when no full-text index exists"""
+
+    def search(self, queryset, query):
+        for term in search_terms(query):
+            queryset = queryset.filter(
+                Q(name__icontains=term) | Q(description__icontains=term) | Q(brand__icontains=term)
+            )
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    def index_products(self, product_ids):
+        pass
+
+    def remove_products(self, product_ids):
+        pass
+
+    def rebuild(self):
+        return 0
+
+
+class SQLiteFTS5Backend(SimpleSearchBackend):
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+
+    def match_expression(self, query):
+        return " ".join('"{}"*'.format(term) for term in search_terms(query))
+
+    def search(self, queryset, query):
+        match = self.match_expression(query)
+        if not match:
+            return super().search(queryset, query)
+        table = queryset.model._meta.db_table
+        return queryset.filter(
+            RawSQL(
+                f'"{table}"."id" IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)',
+                [match],
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            # bm25() is lower-is-better; negate it so every backend ranks descending.
+            # Column weights favour name over brand over description.
+            search_rank=RawSQL(
+                f'(SELECT -bm25({FTS_TABLE}, 10.0, 1.0, 3.0) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id")',
+                [match],
+                output_field=FloatField(),
+            )
+        )
+
+    def index_products(self, product_ids):
+        product_ids = list(product_ids)
+        if not product_ids:
+            return
+        placeholders = ", ".join(["%s"] * len(product_ids))
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", product_ids)
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, name, description, brand) "
+                f"SELECT id, name, coalesce(description, ''), coalesce(brand, '') "
+                f"FROM {Product._meta.db_table} WHERE id IN ({placeholders})",
+                product_ids,
+            )
+
+    def remove_products(self, product_ids):
+        product_ids = list(product_ids)
+        if not product_ids:
+            return
+        placeholders = ", ".join(["%s"] * len(product_ids))
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", product_ids)
+
+    def rebuild(self):
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, name, description, brand) "
+                f"SELECT id, name, coalesce(description, ''), coalesce(brand, '') "
+                f"FROM {Product._meta.db_table}"
+            )
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+            cursor.execute(f"SELECT count(*) FROM {FTS_TABLE}")
+            return cursor.fetchone()[0]
+
+
+class PostgresSearchBackend(SimpleSearchBackend):
+    """tsvector search served by the products_product_search_idx expression index"""
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+
+    def tsquery(self, query):
+        return " & ".join(f"{term}:*" for term in search_terms(query))
+
+    def search(self, queryset, query):
+        tsquery = self.tsquery(query)
+        if not tsquery:
+            return super().search(queryset, query)
+        vector = PG_VECTOR.format(table=f'"{queryset.model._meta.db_table}".')
+        return queryset.filter(
+            RawSQL(f"{vector} @@ to_tsquery('english', %s)", [tsquery], output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(
+                f"ts_rank({vector}, to_tsquery('english', %s))", [tsquery], output_field=FloatField()
+            )
+        )
+
+    def rebuild(self):
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f"REINDEX INDEX {PG_INDEX}")
+        return Product.objects.using(self.using).count()
+
+
+def _fts5_table_exists(using):
+    with connections[using].cursor() as cursor:
+        return FTS_TABLE in connections[using].introspection.table_names(cursor)
+
+
+def get_search_backend(using=DEFAULT_DB_ALIAS):
+    """Return the search backend for a database alias (PRODUCT_SEARCH_BACKEND overrides it)"""
+    if using not in _backends:
+        backend_path = getattr(settings, "PRODUCT_SEARCH_BACKEND", None)
+        vendor = connections[using].vendor
+        if backend_path:
+            backend = import_string(backend_path)()
+        elif vendor == "sqlite" and _fts5_table_exists(using):
+            backend = SQLiteFTS5Backend(using)
+        elif vendor == "postgresql":
+            backend = PostgresSearchBackend(using)
+        else:
+            backend = SimpleSearchBackend()
+        _backends[using] = backend
+    return _backends[using]
+
+
+def search_products(queryset, query):
+    """Filter `queryset` to products matching `query`, annotated with search_rank"""
+    return get_search_backend(queryset.db).search(queryset, query)
@@ -1,4 +1,7 @@
 from rest_framework import serializers
+from .fastpath import FastListSerializer
+from .fieldsets import ExpandableFieldsMixin
+from .images import VARIANTS, variant_name, variant_url
 from .models import Category, Product
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -7,7 +10,61 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    image_variants = serializers.SerializerMethodField()
+    expandable_fields = {"category": (CategorySerializer, {})}
+    field_sources = {"image_variants": ("image", "image_variants")}
+
     class Meta:
         model = Product
         fields = '__all__'
+
+    def get_image_variants(self, obj):
+        if not obj.image:
+            return {}
+        request = self.context.get("request")
+        urls = {variant: variant_url(obj, variant) for variant in VARIANTS}
+        return {
+            variant: request.build_absolute_uri(url) if request else url
+            for variant, url in urls.items()
+        }
+
+
+class PrefetchedCategoryField(serializers.PrimaryKeyRelatedField):
+    """Category lookup from `context["categories"]` (an in_bulk() dict) when provided"""
+
+    def to_internal_value(self, data):
+        categories = self.context.get("categories")
+        if categories is None:
+            return super().to_internal_value(data)
+        try:
+            return categories[int(data)]
+        except (KeyError, TypeError, ValueError):
+            self.fail("does_not_exist", pk_value=data)
+
+
+class BulkProductSerializer(ProductSerializer):
+    """ProductSerializer for batch writes; categories are resolved up front"""
+    category = PrefetchedCategoryField(queryset=Category.objects.all())
+
+
+class ProductListSerializer(FastListSerializer):
+    """ProductSerializer output for list pages, built from values() rows"""
+    serializer_class = ProductSerializer
+    computed_fields = {"image_variants": ("image", "image_variants")}
+
+    def __init__(self, context=None, fields=None):
+        super().__init__(context, fields)
+        self.storage = Product._meta.get_field("image").storage
+        self.request = self.context.get("request")
+
+    def get_image_variants(self, row):
+        if not row["image"]:
+            return {}
+        urls = {
+            variant: self.storage.url(variant_name(row["image"], row["image_variants"], variant))
+            for variant in VARIANTS
+        }
+        if self.request is None:
+            return urls
+        return {variant: self.request.build_absolute_uri(url) for variant, url in urls.items()}
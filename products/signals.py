@@ -0,0 +1,148 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from .category_stats import apply_product_change, refresh_category_stats, storefront_state
+from .images import schedule_variants, variants_current
+from .inventory import LOW_STOCK_THRESHOLD
+from .models import Category, Product
+from .search import get_search_backend
+from .snapshot import bump_catalog_version
+
+# Sent with `product_ids` after bulk writes (imports, bulk API) that bypass
+# the per-instance post_save/post_delete receivers below; `category_ids`
+# optionally lists categories the products were in before the write.
+products_bulk_changed = Signal()
+
+# Fields feeding Category.active_product_count/min_price/max_price.
+CATEGORY_STATS_FIELDS = {"category", "category_id", "is_active", "stock", "price"}
+STATS_COLUMNS = ("category_id", "price", "is_active", "stock")
+
+# Columns the catalog snapshot renders or filters on. Stock only counts by
+# band (out / low / in stock); exact figures refresh with
+# CATALOG_SNAPSHOT_MAX_AGE, so checkout decrements do not reload every worker.
+SNAPSHOT_COLUMNS = ("name", "description", "price", "category_id", "brand", "image", "is_active", "created_at", "stock")
+
+
+@receiver(post_save, sender=Product, dispatch_uid="product_search_index_save")
+def index_saved_product(sender, instance, using, **kwargs):
+    product_id = instance.pk
+    transaction.on_commit(
+        lambda: get_search_backend(using).index_products([product_id]), using=using
+    )
+
+
+@receiver(post_delete, sender=Product, dispatch_uid="product_search_index_delete")
+def remove_deleted_product(sender, instance, using, **kwargs):
+    product_id = instance.pk
+    transaction.on_commit(
+        lambda: get_search_backend(using).remove_products([product_id]), using=using
+    )
+
+
+@receiver(post_save, sender=Product, dispatch_uid="product_image_variants")
+def generate_image_variants(sender, instance, using, **kwargs):
+    if instance.image and not variants_current(instance):
+        product_id = instance.pk
+        transaction.on_commit(lambda: schedule_variants(product_id), using=using)
+
+
+def _saved_columns(update_fields):
+    """Columns written by a save, or None for all of them"""
+    if update_fields is None:
+        return None
+    return {"category_id" if field == "category" else field for field in update_fields}
+
+
+def _affects(columns, update_fields):
+    saved = _saved_columns(update_fields)
+    return saved is None or bool(saved & set(columns))
+
+
+def _column_value(product, column):
+    value = getattr(product, column)
+    if column == "image":
+        return value.name or ""
+    if column == "price":
+        return Product._meta.get_field("price").to_python(value)
+    return value
+
+
+def _stored_row(instance, previous, update_fields):
+    """Column values of `instance` as stored by the save; columns it did not write keep `previous`"""
+    saved = _saved_columns(update_fields)
+    return {
+        column: _column_value(instance, column) if saved is None or column in saved else previous[column]
+        for column in SNAPSHOT_COLUMNS
+    }
+
+
+def _snapshot_view(row):
+    stock = row["stock"]
+    band = 0 if stock <= 0 else 1 if stock <= LOW_STOCK_THRESHOLD else 2
+    return tuple(row[column] or "" if column == "image" else row[column] for column in SNAPSHOT_COLUMNS if column != "stock") + (band,)
+
+
+def _stats_state(row):
+    return storefront_state(*(row[column] for column in STATS_COLUMNS))
+
+
+@receiver(pre_save, sender=Product, dispatch_uid="product_previous_row")
+def remember_previous_row(sender, instance, using, update_fields=None, **kwargs):
+    instance._previous_row = None
+    if instance._state.adding or not _affects(SNAPSHOT_COLUMNS, update_fields):
+        return
+    instance._previous_row = Product.objects.using(using).filter(pk=instance.pk).values(*SNAPSHOT_COLUMNS).first()
+
+
+@receiver(post_save, sender=Product, dispatch_uid="product_category_stats_save")
+def update_saved_product_category(sender, instance, update_fields=None, **kwargs):
+    if not _affects(STATS_COLUMNS, update_fields):
+        return
+    previous = getattr(instance, "_previous_row", None)
+    if previous is None:
+        apply_product_change(None, _stats_state(_stored_row(instance, None, None)))
+    else:
+        apply_product_change(_stats_state(previous), _stats_state(_stored_row(instance, previous, update_fields)))
+
+
+@receiver(post_delete, sender=Product, dispatch_uid="product_category_stats_delete")
+def update_deleted_product_category(sender, instance, **kwargs):
+    apply_product_change(_stats_state(_stored_row(instance, None, None)), None)
+
+
+@receiver(post_save, sender=Product, dispatch_uid="catalog_version_save_Product")
+def bump_catalog_on_visible_change(sender, instance, using, created, update_fields=None, **kwargs):
+    if not created:
+        if not _affects(SNAPSHOT_COLUMNS, update_fields):
+            return
+        previous = getattr(instance, "_previous_row", None)
+        if previous is not None and (
+            _snapshot_view(previous) == _snapshot_view(_stored_row(instance, previous, update_fields))
+        ):
+            return
+    transaction.on_commit(bump_catalog_version, using=using)
+
+
+def _schedule_catalog_bump(sender, using, **kwargs):
+    transaction.on_commit(bump_catalog_version, using=using)
+
+
+post_save.connect(_schedule_catalog_bump, sender=Category, dispatch_uid="catalog_version_save_Category")
+for model in (Product, Category):
+    post_delete.connect(_schedule_catalog_bump, sender=model, dispatch_uid=f"catalog_version_delete_{model.__name__}")
+
+
+@receiver(products_bulk_changed, dispatch_uid="products_bulk_changed_refresh")
+def refresh_bulk_changed_products(sender, product_ids, using="default", category_ids=(), **kwargs):
+    product_ids = list(product_ids)
+    category_ids = set(category_ids)
+
+    def refresh():
+        get_search_backend(using).index_products(product_ids)
+        refresh_category_stats(
+            category_ids | set(Product.objects.filter(pk__in=product_ids).values_list("category_id", flat=True))
+        )
+        bump_catalog_version()
+
+    transaction.on_commit(refresh, using=using)
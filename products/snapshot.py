@@ -0,0 +1,82 @@
+"""
+Per-process catalog snapshot for storefront reads.
+
+Each worker keeps an immutable copy of the categories and the active,
+in-stock products, tagged with the catalog version held in the shared
+cache. products.signals bumps that version whenever a Category, or a
+Product field the storefront shows, is written (stock only when it crosses
+into another band), and the next read in every worker reloads lazily.
+A snapshot is also reloaded once it is older than
+CATALOG_SNAPSHOT_MAX_AGE seconds, in case the version key was evicted.
+"""
+
+import threading
+import time
+from types import MappingProxyType
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Category, Product
+
+CATALOG_VERSION_KEY = "products:catalog:version"
+
+_snapshot = None
+_lock = threading.Lock()
+
+
+def catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    """Mark every worker's snapshot (and the facet cache) as stale"""
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOG_VERSION_KEY, time.time_ns(), None)
+
+
+class CatalogSnapshot:
+    """Read-only categories and storefront products at one catalog version"""
+
+    def __init__(self, version, categories, products):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.categories = tuple(categories)
+        self.products = tuple(products)
+        self.products_by_id = MappingProxyType({product.pk: product for product in self.products})
+
+    def is_current(self, version, max_age):
+        return self.version == version and time.monotonic() - self.loaded_at < max_age
+
+    def newest(self, limit):
+        return sorted(self.products, key=lambda product: (product.created_at, product.pk), reverse=True)[:limit]
+
+
+def load_catalog(version):
+    categories = list(Category.objects.order_by("id"))
+    by_id = {category.pk: category for category in categories}
+    products = list(Product.objects.filter(is_active=True, stock__gt=0).order_by("name", "id"))
+    for product in products:
+        # Share the snapshot's Category objects instead of one query per product.
+        product.category = by_id[product.category_id]
+    return CatalogSnapshot(version, categories, products)
+
+
+def get_catalog():
+    """The current catalog snapshot, reloaded if another worker changed the catalog"""
+    global _snapshot
+    version = catalog_version()
+    max_age = getattr(settings, "CATALOG_SNAPSHOT_MAX_AGE", 300)
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.is_current(version, max_age):
+        return snapshot
+    with _lock:
+        if _snapshot is None or not _snapshot.is_current(version, max_age):
+            _snapshot = load_catalog(version)
+        return _snapshot
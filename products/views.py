@@ -1,8 +1,32 @@
-from rest_framework import viewsets, filters
+from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.settings import api_settings
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 from .models import Category, Product
-from .serializers import CategorySerializer, ProductSerializer
+from .serializers import CategorySerializer, ProductListSerializer, ProductSerializer
+from .bulk import BulkPayloadError, bulk_create_products, bulk_delete_products, bulk_update_products
+from .conditional import ConditionalGetMixin
+from .facets import get_facets, storefront_filters
+from .fastpath import FastListMixin
+from .pagination import KeysetPagination
+from .popularity import record_view
+from .search import search_products
+
+class ProductSearchFilter(filters.SearchFilter):
+    """`?search=` through the full-text backend, ranked unless `?ordering=` is given"""
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+        queryset = search_products(queryset, query)
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by("-search_rank", "-created_at")
+        return queryset
+
 
 class IsAdminOrReadOnly(BasePermission):
     def has_permission(self, request, view):
@@ -10,23 +34,61 @@ class IsAdminOrReadOnly(BasePermission):
             return True
         return request.user and request.user.is_staff
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [IsAdminOrReadOnly]  
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    fast_list_serializer_class = ProductListSerializer
     filter_backends = [
         DjangoFilterBackend,
         filters.OrderingFilter,
-        filters.SearchFilter
+        ProductSearchFilter
     ]
     filterset_fields = ['category', 'price']
-    ordering_fields = ['price', 'stock']
+    ordering_fields = ['price', 'stock', 'name', 'created_at', 'views']
+    pagination_class = KeysetPagination
     search_fields = ['name', 'description']
     permission_classes = [IsAdminOrReadOnly]  
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            record_view(int(self.kwargs["pk"]))
+        return response
+
+    @action(detail=False, methods=["post", "patch", "delete"], url_path="bulk")
+    def bulk(self, request):
+        """Create (POST), partially update (PATCH, items carry `id`) or delete (DELETE, ids) many products"""
+        context = self.get_serializer_context()
+        try:
+            if request.method == "POST":
+                results = bulk_create_products(request.data, context)
+            elif request.method == "PATCH":
+                results = bulk_update_products(request.data, context)
+            else:
+                results = bulk_delete_products(request.data)
+        except BulkPayloadError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        failed = sum(result["status"] == "error" for result in results)
+        return Response({
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "results": results,
+        })
+
+
+class ProductFacetsView(APIView):
+    """Facet counts for the storefront filters (`search`, `category`, `brand`, `min_price`, `max_price`, `stock`)"""
+    permission_classes = [IsAdminOrReadOnly]
+
+    def get(self, request):
+        filters = storefront_filters(request.query_params)
+        return Response(dict(get_facets(filters), filters=filters))
+
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
@@ -41,3 +103,4 @@ def ajax_add_category(request):
             category, created = Category.objects.get_or_create(name=name)
             return JsonResponse({"id": category.id, "name": category.name})
     return JsonResponse({"error": "Invalid request"}, status=400)
+